@@ -0,0 +1,101 @@
+# Synthetic placement datasets and resume PDFs for benchmarking.
+#
+#     python -m benchmarks.generate 100000 -o placement_100k.csv
+import argparse
+import io
+
+import numpy as np
+import pandas as pd
+
+from hirelytics.schema import REQUIRED_COLS
+
+BRANCHES = ['CSE', 'IT', 'ECE', 'EEE', 'ME', 'CE', 'AIDS', 'CHEM']
+COMPANIES = [f"Company {i:03d}" for i in range(150)]
+SKILLS = [
+    'python', 'java', 'c++', 'sql', 'javascript', 'react', 'node.js', 'machine learning',
+    'deep learning', 'data analysis', 'excel', 'power bi', 'tableau', 'aws', 'azure', 'docker',
+    'kubernetes', 'linux', 'git', 'html', 'css', 'django', 'flask', 'spring boot', 'tensorflow',
+    'pytorch', 'nlp', 'computer vision', 'autocad', 'solidworks', 'matlab', 'embedded c',
+    'vlsi', 'iot', 'communication', 'leadership', 'statistics', 'r', 'spark', 'hadoop',
+]
+
+
+def placement_frame(rows, seed=0):
+    """A DataFrame in the REQUIRED_COLS schema with ``rows`` synthetic students."""
+    rng = np.random.default_rng(seed)
+    cgpa = np.clip(rng.normal(7.4, 1.0, rows), 4.0, 10.0).round(2)
+    internship = rng.random(rows) < 0.55
+    skill_counts = rng.integers(2, 7, rows)
+    popularity = 1.0 / np.arange(1, len(SKILLS) + 1)
+    popularity /= popularity.sum()
+    skill_ids = rng.choice(len(SKILLS), size=(rows, 6), p=popularity)
+    skills = [
+        ", ".join(dict.fromkeys(SKILLS[i] for i in ids[:n]))
+        for ids, n in zip(skill_ids, skill_counts)
+    ]
+    logit = -9.0 + 1.1 * cgpa + 0.9 * internship + 0.25 * skill_counts
+    placed = rng.random(rows) < 1.0 / (1.0 + np.exp(-logit))
+    package = np.where(placed, rng.lognormal(1.7, 0.5, rows), 0.0).round(2)
+    company = np.where(placed, rng.choice(COMPANIES, rows), "")
+    df = pd.DataFrame({
+        'CGPA': cgpa,
+        'Package': package,
+        'Company': company,
+        'Branch': rng.choice(BRANCHES, rows, p=[.25, .15, .15, .1, .1, .1, .1, .05]),
+        'Internship': np.where(internship, 'Yes', 'No'),
+        'Year': rng.integers(2018, 2026, rows),
+        'Skills': skills,
+    })
+    return df[REQUIRED_COLS]
+
+
+def resume_text(pages=2, seed=0):
+    """Plausible resume prose mentioning a random subset of SKILLS."""
+    rng = np.random.default_rng(seed)
+    filler = ("responsible for designing building and maintaining services with the team "
+              "delivered projects on time and improved reporting accuracy").split()
+    lines = []
+    for _ in range(pages * 45):
+        words = list(rng.choice(filler, 10))
+        if rng.random() < 0.3:
+            words.insert(int(rng.integers(0, 10)), str(rng.choice(SKILLS)))
+        lines.append(" ".join(words))
+    if rng.random() < 0.5:
+        lines.append("summer internship at company")
+    return "\n".join(lines)
+
+
+def resume_pdf(pages=2, seed=0):
+    """A synthetic resume PDF (bytes) with ``pages`` pages of text."""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    lines = resume_text(pages, seed).split("\n")
+    for page in range(pages):
+        text = c.beginText(40, A4[1] - 50)
+        text.setFont("Helvetica", 10)
+        for line in lines[page * 45:(page + 1) * 45]:
+            text.textLine(line)
+        c.drawText(text)
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a synthetic placement dataset.")
+    parser.add_argument("rows", type=int)
+    parser.add_argument("-o", "--output", required=True, help=".csv or .xlsx output path")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    df = placement_frame(args.rows, args.seed)
+    if args.output.endswith(".xlsx"):
+        df.to_excel(args.output, index=False)
+    else:
+        df.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
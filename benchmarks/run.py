@@ -0,0 +1,146 @@
+# Time the Hirelytics hot paths on synthetic data and write JSON results.
+#
+#     python -m benchmarks.run --sizes 1000 100000 1000000 -o bench.json
+#
+# Each benchmark reports the best and median wall time over ``--repeat``
+# runs so results are comparable across commits and machines.
+import argparse
+import io
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from benchmarks.generate import placement_frame, resume_pdf, resume_text
+from hirelytics.aggregates import build_aggregates
+from hirelytics.dataset import parse_placement_file
+from hirelytics.ingest import ingest
+from hirelytics.model import TrainingSet, fit_model
+from hirelytics.partitions import append_partitions
+from hirelytics.pdf_text import extract_text
+from hirelytics.resume import analyze_resume, placement_profile
+from hirelytics.resume_render import ResumeData, render_resume
+from hirelytics.schema import normalize_frame
+from hirelytics.skills import SkillIndex
+from hirelytics.snapshot import frame_to_ipc
+from hirelytics.storage import LocalStorage
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+# Excel generation and parsing are slow; larger sizes only time CSV.
+MAX_XLSX_ROWS = 100_000
+USER_SKILLS = ["python", "sql", "machine learning", "docker"]
+
+
+def measure(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return {"best_s": round(min(times), 6), "median_s": round(statistics.median(times), 6), "runs": repeat}
+
+
+def dataset_benchmarks(rows, repeat):
+    df = placement_frame(rows)
+    csv_bytes = df.to_csv(index=False).encode()
+    results = {"csv_bytes": len(csv_bytes)}
+
+    results["parse_csv"] = measure(lambda: normalize_frame(parse_placement_file("data.csv", csv_bytes)), repeat)
+    results["ingest_csv"] = measure(lambda: ingest(io.BytesIO(csv_bytes), "data.csv").close(), repeat)
+    if rows <= MAX_XLSX_ROWS:
+        buffer = io.BytesIO()
+        df.to_excel(buffer, index=False)
+        xlsx_bytes = buffer.getvalue()
+        results["ingest_xlsx"] = measure(lambda: ingest(io.BytesIO(xlsx_bytes), "data.xlsx").close(), repeat)
+
+    df = normalize_frame(parse_placement_file("data.csv", csv_bytes))
+    results["snapshot_write"] = measure(lambda: frame_to_ipc(df), repeat)
+    results["skill_index"] = measure(lambda: SkillIndex.from_frame(df), repeat)
+    index = SkillIndex.from_frame(df)
+    training = TrainingSet(df, index)
+    results["skill_match"] = measure(lambda: training.skill_match(USER_SKILLS), repeat)
+    results["fit_model"] = measure(lambda: fit_model(training, USER_SKILLS), repeat)
+    results["aggregates"] = measure(lambda: build_aggregates(df), repeat)
+    return df, index, results
+
+
+def append_benchmarks(df, repeat):
+    """Time appending to existing year partitions."""
+    half = len(df) // 2
+    with tempfile.TemporaryDirectory() as root:
+        storage = LocalStorage(root)
+        append_partitions(storage, "bench", df.iloc[:half])
+        # Re-appending the same rows replaces them (dedup on every column),
+        # so every run merges into partitions read back from storage.
+        result = measure(lambda: append_partitions(storage, "bench", df.iloc[half:]), repeat)
+    return {"append_partitions": result}
+
+
+def resume_benchmarks(df, index, repeat, pages=2):
+    profile = placement_profile(df, index)
+    text = resume_text(pages)
+    pdf = resume_pdf(pages)
+    return {
+        "pdf_bytes": len(pdf),
+        "extract_text": measure(lambda: extract_text(pdf), repeat),
+        "fuzzy_match": measure(lambda: analyze_resume(text, profile), repeat),
+    }
+
+
+def render_benchmarks(repeat):
+    resume = ResumeData(
+        name="Jane Doe", title="Software Engineer", about=resume_text(1, seed=1)[:600],
+        email="jane@example.com", phone="+91 00000 00000", address="Chennai",
+        education="B.E. Computer Science, 2024", skills="Python, SQL, Docker",
+        experience=resume_text(2, seed=2),
+    )
+    return {"render_resume": measure(lambda: render_resume(resume), repeat)}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(sizes, repeat):
+    results = {
+        "started_at": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "repeat": repeat,
+        "datasets": {},
+    }
+    df = index = None
+    for rows in sizes:
+        print(f"benchmarking {rows} rows", file=sys.stderr)
+        df, index, results["datasets"][str(rows)] = dataset_benchmarks(rows, repeat)
+        results["datasets"][str(rows)].update(append_benchmarks(df, repeat))
+    if df is not None:
+        results["resume"] = resume_benchmarks(df, index, repeat)
+    results["render"] = render_benchmarks(repeat)
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Hirelytics hot paths on synthetic data.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="dataset row counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("-o", "--output", default="-", help="JSON output path (default: stdout)")
+    args = parser.parse_args(argv)
+    report = json.dumps(run(args.sizes, args.repeat), indent=2)
+    if args.output == "-":
+        print(report)
+    else:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+
+
+if __name__ == "__main__":
+    main()
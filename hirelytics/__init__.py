@@ -0,0 +1 @@
+# Shared, Streamlit-independent building blocks used by the Hirelytics pages.
@@ -0,0 +1,138 @@
+# Precomputed dashboard aggregates for every (Branch, Year) slice.
+#
+# The dashboards show the same handful of aggregates under a Branch/Year
+# filter.  They are materialized once per dataset version for every
+# combination of branch (or "All") and year (or "All"), so a filter change is
+# a dictionary lookup.  Each row lands in four slices, so building the whole
+# cube costs about four passes over the data.
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from hirelytics import metrics
+
+ALL = "All"
+AGGREGATE_COLS = ['CGPA', 'Package', 'Company', 'Branch', 'Internship', 'Year']
+BOX_COLS = ['Internship', 'count', 'lower', 'q1', 'median', 'q3', 'upper']
+
+# Upper bounds on what a single chart ships to the browser.
+MAX_SCATTER_POINTS = 2000
+MAX_OUTLIERS = 200
+
+
+@dataclass(frozen=True)
+class SliceAggregates:
+    rows: np.ndarray               # positions of the slice's rows in the frame
+    top_companies: pd.Series       # Company -> count, top 5
+    branch_avg_package: pd.Series  # Branch -> mean Package
+    year_counts: pd.DataFrame      # Year, Count (sorted by Year)
+    internship_box: pd.DataFrame   # BOX_COLS, one row per Internship value
+    box_outliers: pd.DataFrame     # Internship, Package (at most MAX_OUTLIERS)
+    scatter: pd.DataFrame          # CGPA, Package, Branch (at most MAX_SCATTER_POINTS)
+
+
+@dataclass(frozen=True)
+class Aggregates:
+    branches: list
+    years: list
+    slices: dict                   # (branch, year) -> SliceAggregates
+
+    def get(self, branch=ALL, year=ALL):
+        return self.slices.get((branch, str(year)))
+
+
+def year_labels(df):
+    """Year values as the strings used by the filters (missing -> None)."""
+    years = df['Year']
+    return years.astype(str).where(years.notna(), None)
+
+
+def stratified_sample(labels, max_points, seed=0):
+    """Positions of at most ``max_points`` items, sampled proportionally per label.
+
+    Every label keeps at least one point, so small groups stay visible.
+    """
+    n = len(labels)
+    if n <= max_points:
+        return np.arange(n)
+    rng = np.random.default_rng(seed)
+    codes = pd.factorize(pd.Series(labels), use_na_sentinel=False)[0]
+    counts = np.bincount(codes)
+    quotas = np.maximum(1, np.floor(counts * max_points / n).astype(int))
+    picked = []
+    for code, quota in enumerate(quotas):
+        members = np.flatnonzero(codes == code)
+        picked.append(members if quota >= len(members) else rng.choice(members, quota, replace=False))
+    return np.sort(np.concatenate(picked))
+
+
+def box_stats(values, groups, max_outliers=MAX_OUTLIERS):
+    """Tukey box statistics (1.5 IQR whiskers) of ``values`` per group label.
+
+    Returns ``(stats, outliers)``; outliers are sampled down to
+    ``max_outliers`` points in total.
+    """
+    records = []
+    outliers = []
+    frame = pd.DataFrame({'group': groups, 'value': values}).dropna()
+    for label, series in frame.groupby('group', sort=True)['value']:
+        q1, median, q3 = np.percentile(series, [25, 50, 75])
+        iqr = q3 - q1
+        is_inside = (series >= q1 - 1.5 * iqr) & (series <= q3 + 1.5 * iqr)
+        inside = series[is_inside]
+        records.append((label, len(series), inside.min(), q1, median, q3, inside.max()))
+        outliers.append(pd.DataFrame({'Internship': label, 'Package': series[~is_inside].to_numpy()}))
+    stats = pd.DataFrame.from_records(records, columns=BOX_COLS)
+    outliers = pd.concat(outliers, ignore_index=True) if outliers else pd.DataFrame(columns=['Internship', 'Package'])
+    keep = stratified_sample(outliers['Internship'].to_numpy(), max_outliers)
+    return stats, outliers.iloc[keep].reset_index(drop=True)
+
+
+def _plain_index(series):
+    # Categorical columns give a CategoricalIndex; charts want plain labels.
+    return series.set_axis(series.index.astype(object))
+
+
+def slice_aggregates(df, rows):
+    part = df.iloc[rows]
+    year_counts = part.groupby('Year').size().reset_index(name='Count').sort_values(by='Year')
+    box, outliers = box_stats(part['Package'].to_numpy(dtype=float), part['Internship'].to_numpy(dtype=object))
+    points = part[['CGPA', 'Package', 'Branch']].astype({'Branch': object})
+    points = points.iloc[stratified_sample(points['Branch'].to_numpy(), MAX_SCATTER_POINTS)]
+    company_counts = part['Company'].value_counts()
+    return SliceAggregates(
+        rows=rows,
+        top_companies=_plain_index(company_counts[company_counts > 0].head(5)),
+        branch_avg_package=_plain_index(part.groupby('Branch', observed=True)['Package'].mean()),
+        year_counts=year_counts.reset_index(drop=True),
+        internship_box=box,
+        box_outliers=outliers,
+        scatter=points.reset_index(drop=True),
+    )
+
+
+@metrics.timed("aggregates")
+def build_aggregates(df):
+    branches = df['Branch'].to_numpy(dtype=object)
+    years = year_labels(df).to_numpy(dtype=object)
+    branch_keys = sorted({b for b in branches if b is not None and b == b})
+    year_keys = sorted({y for y in years if y is not None})
+
+    slice_rows = {(ALL, ALL): np.arange(len(df))}
+    for column, keys, make_key in ((branches, branch_keys, lambda k: (k, ALL)),
+                                   (years, year_keys, lambda k: (ALL, k))):
+        for key, rows in pd.Series(column).groupby(column, sort=False).indices.items():
+            if key in keys:
+                slice_rows[make_key(key)] = rows
+    pairs = pd.DataFrame({'b': branches, 'y': years}).dropna()
+    for (branch, year), rows in pairs.groupby(['b', 'y'], sort=False).indices.items():
+        slice_rows[(branch, year)] = pairs.index.to_numpy()[rows]
+
+    slices = {key: slice_aggregates(df, np.sort(rows)) for key, rows in slice_rows.items()}
+    return Aggregates(branch_keys, year_keys, slices)
+
+
+def aggregates_for(cache, dataset_sha, df):
+    """The dataset's Aggregates, built once per SHA in the shared content cache."""
+    return cache.derived(dataset_sha, "aggregates", lambda: build_aggregates(df))
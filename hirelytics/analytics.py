@@ -0,0 +1,170 @@
+# Cross-college comparative analytics.
+#
+# The consolidated store keeps one compact frame per college (categorical
+# Branch/Company, float32 Package) and a concatenation of all of them.  On
+# refresh each college's dataset version is checked (a TTL-cached stat) and
+# only colleges whose version changed are reloaded, concurrently; the Admin
+# page's write paths reload just the college they changed.  Queries are
+# vectorized group-bys over the consolidated frame.
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from hirelytics.dataset import load_placement_frame
+
+STORE_COLS = ['Branch', 'Company', 'Year', 'Package']
+PERCENTILES = (25, 50, 75, 90)
+
+
+def compact_frame(college_code, df):
+    out = pd.DataFrame({
+        'College': college_code,
+        'Branch': df['Branch'],
+        'Company': df['Company'],
+        'Year': pd.to_numeric(df['Year'], errors="coerce").astype("Int32"),
+        'Package': df['Package'].astype("float32"),
+    })
+    out['Placed'] = (out['Package'] > 0).to_numpy()
+    return out
+
+
+class AnalyticsStore:
+    def __init__(self, storage, max_workers=8):
+        self.storage = storage
+        self.max_workers = max_workers
+        self._versions = {}          # college -> dataset SHA
+        self._frames = {}            # college -> compact frame
+        self._combined = None
+        self._lock = threading.Lock()
+
+    def _load(self, college_code):
+        # Unchanged datasets come back from the content cache without parsing;
+        # only a changed version is compacted again.
+        sha, df = load_placement_frame(self.storage, college_code)
+        with self._lock:
+            if college_code in self._versions and self._versions[college_code] == sha:
+                return college_code, sha, False, None
+        if df is None or not all(col in df.columns for col in STORE_COLS):
+            return college_code, sha, True, None
+        return college_code, sha, True, compact_frame(college_code, df)
+
+    def _apply(self, loaded):
+        # Caller holds the lock; returns the codes whose frame changed.
+        changed = []
+        for code, sha, is_changed, frame in loaded:
+            if not is_changed:
+                continue
+            changed.append(code)
+            self._versions[code] = sha
+            if frame is None:
+                self._frames.pop(code, None)
+            else:
+                self._frames[code] = frame
+        return changed
+
+    def refresh(self, college_codes):
+        """Bring the store up to date for ``college_codes``; returns the reloaded codes."""
+        college_codes = list(college_codes)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            loaded = list(pool.map(self._load, college_codes))
+        with self._lock:
+            changed = self._apply(loaded)
+            for code in set(self._versions) - set(college_codes):
+                self._frames.pop(code, None)
+                del self._versions[code]
+                changed.append(code)
+            if changed or self._combined is None:
+                self._combined = self._concat()
+        return changed
+
+    def refresh_college(self, college_code):
+        """Reload one college after its data was written; the others are left as they are.
+
+        Does nothing until the store has been loaded, since the first
+        refresh loads every college anyway.  Returns True if it reloaded.
+        """
+        with self._lock:
+            if self._combined is None:
+                return False
+        loaded = self._load(college_code)
+        with self._lock:
+            if self._apply([loaded]):
+                self._combined = self._concat()
+        return loaded[2]
+
+    def _concat(self):
+        if not self._frames:
+            empty = compact_frame("", pd.DataFrame(columns=STORE_COLS))
+            return empty.astype({col: "category" for col in ('College', 'Branch', 'Company')})
+        combined = pd.concat(self._frames.values(), ignore_index=True)
+        for col in ('College', 'Branch', 'Company'):
+            combined[col] = combined[col].astype("category")
+        return combined
+
+    @property
+    def frame(self):
+        with self._lock:
+            return self._combined
+
+    # -- queries -------------------------------------------------------------
+    def package_percentiles(self, percentiles=PERCENTILES, branch=None):
+        """Package percentiles of placed students per (College, Branch)."""
+        df = self.frame
+        df = df[df['Placed']]
+        if branch is not None:
+            df = df[df['Branch'] == branch]
+        columns = [f"p{p}" for p in percentiles]
+        if df.empty:
+            # e.g. a branch in which no college has placed students yet
+            return pd.DataFrame(columns=['College', 'Branch', *columns, 'Placed'])
+        grouped = df.groupby(['College', 'Branch'], observed=True)['Package']
+        result = grouped.quantile([p / 100 for p in percentiles]).unstack()
+        result.columns = columns
+        result['Placed'] = grouped.size()
+        return result.reset_index()
+
+    def company_overlap(self):
+        """College x college matrix of the number of hiring companies they share."""
+        df = self.frame
+        df = df[df['Placed']].dropna(subset=['Company'])
+        colleges = df['College'].cat.remove_unused_categories()
+        companies = df['Company'].cat.remove_unused_categories()
+        indicator = sparse.csr_matrix(
+            (np.ones(len(df), dtype=np.int32), (colleges.cat.codes, companies.cat.codes)),
+            shape=(len(colleges.cat.categories), len(companies.cat.categories)),
+        )
+        indicator.data[:] = 1  # duplicate (college, company) pairs were summed
+        shared = (indicator @ indicator.T).toarray()
+        return pd.DataFrame(shared, index=colleges.cat.categories, columns=colleges.cat.categories)
+
+    def placement_rates(self):
+        """Placement rate per College and Year with the year-over-year change."""
+        df = self.frame.dropna(subset=['Year'])
+        rates = df.groupby(['College', 'Year'], observed=True)['Placed'].agg(['mean', 'size'])
+        rates = rates.rename(columns={'mean': 'PlacementRate', 'size': 'Students'}).reset_index()
+        rates = rates.sort_values(['College', 'Year'])
+        rates['YoYChange'] = rates.groupby('College', observed=True)['PlacementRate'].diff()
+        return rates.reset_index(drop=True)
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def analytics_store(storage):
+    """The process-wide AnalyticsStore for ``storage``."""
+    with _stores_lock:
+        store = _stores.get(id(storage))
+        if store is None:
+            store = _stores[id(storage)] = AnalyticsStore(storage)
+        return store
+
+
+def college_changed(storage, college_code):
+    """Reload ``college_code`` in ``storage``'s store in the background after a write."""
+    from hirelytics.jobs import job_service
+
+    return job_service().submit("analytics", analytics_store(storage).refresh_college, college_code)
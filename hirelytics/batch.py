@@ -0,0 +1,150 @@
+# Batch resume screening for placement officers.
+#
+# Runs the Resume Analyzer over a ZIP archive or directory of PDFs on a
+# process pool and produces one CSV row per resume.  Usable from the Admin
+# page or headless:
+#
+#     python -m hirelytics.batch placement_data.csv resumes.zip -o screening.csv
+import argparse
+import csv
+import io
+import os
+import sys
+import zipfile
+from contextlib import nullcontext
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from hirelytics.jobs import mp_context
+from hirelytics.pdf_text import extract_text
+from hirelytics.resume import analyze_resume, placement_profile
+from hirelytics.skills import SkillIndex
+
+FIELDS = ["file", "matched_skills", "missing_skills", "has_internship", "suggest_internship", "error"]
+
+
+def iter_pdfs(source):
+    """Yield ``(name, bytes)`` for every PDF in a ZIP (path or file object) or directory."""
+    if isinstance(source, (str, os.PathLike)) and os.path.isdir(source):
+        for root, _, files in os.walk(source):
+            for name in sorted(files):
+                if name.lower().endswith(".pdf"):
+                    path = os.path.join(root, name)
+                    with open(path, "rb") as f:
+                        yield os.path.relpath(path, source), f.read()
+        return
+    with zipfile.ZipFile(source) as archive:
+        for info in archive.infolist():
+            if not info.is_dir() and info.filename.lower().endswith(".pdf"):
+                yield info.filename, archive.read(info)
+
+
+def count_pdfs(source):
+    if isinstance(source, (str, os.PathLike)) and os.path.isdir(source):
+        return sum(name.lower().endswith(".pdf") for _, _, files in os.walk(source) for name in files)
+    with zipfile.ZipFile(source) as archive:
+        return sum(1 for info in archive.infolist() if not info.is_dir() and info.filename.lower().endswith(".pdf"))
+
+
+def analyze_pdf(name, data, profile):
+    """One CSV row for the resume ``data``; errors are reported, not raised."""
+    try:
+        analysis = analyze_resume(extract_text(data), profile)
+    except Exception as e:
+        return {"file": name, "error": str(e) or type(e).__name__}
+    return {
+        "file": name,
+        "matched_skills": "; ".join(analysis.matched_skills),
+        "missing_skills": "; ".join(analysis.missing_skills),
+        "has_internship": "Yes" if analysis.has_internship else "No",
+        "suggest_internship": "Yes" if analysis.suggest_internship else "No",
+        "error": "",
+    }
+
+
+def analyze_batch(pdfs, profile, max_workers=None, window=None, executor=None):
+    """Analyze ``(name, bytes)`` pairs on a process pool, yielding rows as they finish.
+
+    ``executor`` is a shared process pool to use (e.g. the job service's
+    "pdf_text" pool); without one a pool of ``max_workers`` is started.  At
+    most ``window`` resumes are in flight at once, so only that many PDFs
+    are held in memory regardless of the size of the batch.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    window = window or max_workers * 4
+    pdfs = iter(pdfs)
+    if executor is None:
+        executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context())
+    else:
+        executor = nullcontext(executor)
+    with executor as pool:
+        pending = set()
+        while True:
+            for name, data in pdfs:
+                pending.add(pool.submit(analyze_pdf, name, data, profile))
+                if len(pending) >= window:
+                    break
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def screen_archive(data, profile, executor=None, progress=None):
+    """Screen every PDF in the ZIP archive bytes ``data``; return rows sorted by file.
+
+    ``progress(done, total)`` is called after each resume.
+    """
+    source = io.BytesIO(data)
+    total = count_pdfs(source)
+    rows = []
+    for row in analyze_batch(iter_pdfs(source), profile, executor=executor):
+        rows.append(row)
+        if progress is not None:
+            progress(len(rows), total)
+    rows.sort(key=lambda row: row["file"])
+    return rows
+
+
+def write_csv(rows, out):
+    writer = csv.DictWriter(out, fieldnames=FIELDS)
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(row)
+
+
+def rows_to_csv(rows):
+    buffer = io.StringIO()
+    write_csv(rows, buffer)
+    return buffer.getvalue()
+
+
+def main(argv=None):
+    from hirelytics.dataset import read_placement_path
+
+    parser = argparse.ArgumentParser(description="Screen a batch of resumes against placement data.")
+    parser.add_argument("data", help="placement data file (.csv, .xlsx or .arrow)")
+    parser.add_argument("resumes", help="ZIP archive or directory of resume PDFs")
+    parser.add_argument("-o", "--output", help="output CSV (default: stdout)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes")
+    args = parser.parse_args(argv)
+
+    df = read_placement_path(args.data)
+    profile = placement_profile(df, SkillIndex.from_frame(df))
+    total = count_pdfs(args.resumes)
+
+    def progress(rows):
+        for done, row in enumerate(rows, 1):
+            print(f"[{done}/{total}] {row['file']}", file=sys.stderr)
+            yield row
+
+    rows = progress(analyze_batch(iter_pdfs(args.resumes), profile, args.workers))
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8") as out:
+            write_csv(rows, out)
+    else:
+        write_csv(rows, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+# Altair charts drawn from precomputed aggregates.
+import altair as alt
+
+
+def boxplot_chart(box, outliers=None, x="Internship", y_title="Package"):
+    """Box plot from precomputed ``box_stats`` output (no raw rows shipped)."""
+    base = alt.Chart(box).encode(x=alt.X(f"{x}:N", title=x))
+    whiskers = base.mark_rule().encode(
+        y=alt.Y("lower:Q", title=y_title),
+        y2="upper:Q",
+    )
+    boxes = base.mark_bar(size=30).encode(
+        y="q1:Q",
+        y2="q3:Q",
+        tooltip=[x, "count", "lower", "q1", "median", "q3", "upper"],
+    )
+    medians = base.mark_tick(color="white", size=30).encode(y="median:Q")
+    chart = whiskers + boxes + medians
+    if outliers is not None and len(outliers):
+        chart += alt.Chart(outliers).mark_point().encode(x=f"{x}:N", y="Package:Q")
+    return chart
+
+
+def probability_chart(surface, cgpa=None, skill_match=None):
+    """Placement probability vs CGPA, one line per SkillMatch count.
+
+    ``surface`` is ``PlacementModel.surface`` output; the student's own
+    CGPA is marked with a rule and their skill count drawn emphasised.
+    Clicking a legend entry highlights that line.
+    """
+    highlight = alt.selection_point(fields=["SkillMatch"], bind="legend")
+    lines = alt.Chart(surface).mark_line().encode(
+        x=alt.X("CGPA:Q", title="CGPA"),
+        y=alt.Y("Probability:Q", title="Placement Probability", axis=alt.Axis(format="%"), scale=alt.Scale(domain=[0, 1])),
+        color=alt.Color("SkillMatch:O", title="Matching Skills"),
+        strokeWidth=(
+            alt.condition(alt.datum.SkillMatch == skill_match, alt.value(4), alt.value(1.5))
+            if skill_match is not None else alt.value(2)
+        ),
+        opacity=alt.condition(highlight, alt.value(1.0), alt.value(0.2)),
+        tooltip=["CGPA", "SkillMatch", alt.Tooltip("Probability:Q", format=".1%")],
+    ).add_params(highlight)
+    if cgpa is None:
+        return lines
+    marker = alt.Chart(alt.Data(values=[{"CGPA": cgpa}])).mark_rule(strokeDash=[4, 4]).encode(x="CGPA:Q")
+    return lines + marker
@@ -0,0 +1,80 @@
+# Loading placement data files into pandas.
+import base64
+import io
+
+import pandas as pd
+
+from hirelytics import metrics
+from hirelytics.schema import compact_dtypes, normalize_frame
+from hirelytics.partitions import load_manifest, load_partitioned_frame, manifest_path
+from hirelytics.snapshot import load_snapshot, write_snapshot
+
+
+def placement_paths(college_code):
+    return f"placement_data_{college_code}.csv", f"placement_data_{college_code}.xlsx"
+
+
+def placement_data_exists(storage, college_code):
+    paths = (manifest_path(college_code), *placement_paths(college_code))
+    return any(storage.exists(path) for path in paths)
+
+
+def parse_placement_file(path, data):
+    # XLSX uploads are stored as base64 text, CSV uploads as plain text.
+    with metrics.span("parse"):
+        if path.endswith(".xlsx"):
+            df = pd.read_excel(io.BytesIO(base64.b64decode(data)))
+        else:
+            df = pd.read_csv(io.BytesIO(data))
+        df.columns = df.columns.str.strip()
+    metrics.incr("rows_parsed", len(df))
+    return df
+
+
+def load_placement_frame(storage, college_code, backfill=False):
+    """Return ``(source_sha, frame)`` for a college, or ``(None, None)``.
+
+    Year-partitioned data (see hirelytics.partitions) takes precedence and
+    is versioned by its manifest SHA.  For single-file data the columnar
+    snapshot is used when it matches the current source file; otherwise the
+    source is parsed (and, with ``backfill``, a snapshot is written for the
+    next reader).  The frame is dtype-compacted and shared between sessions,
+    so callers must not mutate it in place.
+    """
+    manifest = load_manifest(storage, college_code)
+    if manifest is not None:
+        return manifest.sha, load_partitioned_frame(storage, manifest)
+    for path in placement_paths(college_code):
+        sha = storage.stat(path)
+        if sha is None:
+            continue
+        df = load_snapshot(storage, college_code, sha)
+        if df is None:
+            stored = storage.get(path)
+            normalized = None
+
+            def build():
+                nonlocal normalized
+                normalized = normalize_frame(parse_placement_file(path, stored.data))
+                return compact_dtypes(normalized)
+
+            df = storage.cache.derived(sha, "frame", build)
+            if backfill:
+                # The snapshot keeps float64 columns, so it is written from the
+                # normalized frame rather than the compacted one
+                if normalized is None:
+                    normalized = normalize_frame(parse_placement_file(path, stored.data))
+                write_snapshot(storage, college_code, normalized, sha)
+        return sha, df
+    return None, None
+
+
+def read_placement_path(path):
+    """Read a local placement file (.csv, .xlsx or .arrow snapshot) into a normalized frame."""
+    if path.endswith(".arrow"):
+        import pyarrow as pa
+
+        return normalize_frame(pa.ipc.open_file(pa.memory_map(path, "r")).read_all().to_pandas())
+    if path.endswith(".xlsx"):
+        return normalize_frame(pd.read_excel(path))
+    return normalize_frame(pd.read_csv(path))
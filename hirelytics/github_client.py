@@ -0,0 +1,102 @@
+# Process-wide GitHub client shared by every Streamlit session.
+#
+# One Github instance (one pooled HTTP session) and one repository handle per
+# process.  Reads go through GitHubClient.call, which retries rate-limit 403s,
+# 429s and 5xx responses with exponential backoff.  Writes go through
+# GitHubClient.write, which only retries requests GitHub rejected for rate
+# limiting: a write that timed out or failed with a 5xx may still have been
+# committed, so repeating it is not safe.  The client also tracks the
+# remaining API quota from response headers so the storage layer can fall
+# back to cached content when the quota runs low.
+import logging
+import re
+import threading
+
+import requests
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+LOW_QUOTA = 100
+ATTEMPTS = 4
+POOL_SIZE = 16
+
+
+def is_rate_limited(exc):
+    """True if GitHub rejected the request without acting on it (rate limits)."""
+    from github import GithubException, RateLimitExceededException
+
+    if isinstance(exc, RateLimitExceededException):
+        return True
+    if isinstance(exc, GithubException):
+        if exc.status == 403:
+            # Only the (secondary) rate limit is transient; other 403s are not.
+            return "rate limit" in str(exc.data).lower()
+        return exc.status == 429
+    return False
+
+
+def is_retryable(exc):
+    from github import GithubException
+
+    if is_rate_limited(exc):
+        return True
+    if isinstance(exc, GithubException):
+        return exc.status in RETRY_STATUSES
+    return isinstance(exc, (requests.ConnectionError, requests.Timeout))
+
+
+def parse_repo_url(repo_url):
+    match = re.search(r"github\.com/([^/]+)/([^.]+)", repo_url)
+    return f"{match.group(1)}/{match.group(2)}"
+
+
+class GitHubClient:
+    def __init__(self, token, repo_url, low_quota=LOW_QUOTA, attempts=ATTEMPTS, pool_size=POOL_SIZE):
+        from github import Auth, Github
+
+        # Retries are handled here (with tenacity) rather than by urllib3.
+        self.github = Github(auth=Auth.Token(token), retry=None, pool_size=pool_size)
+        self.repo_full_name = parse_repo_url(repo_url)
+        self.low_quota = low_quota
+        self.attempts = attempts
+        self._repo = None
+        self._lock = threading.Lock()
+
+    def _retrying(self, predicate):
+        return Retrying(
+            retry=retry_if_exception(predicate),
+            stop=stop_after_attempt(self.attempts),
+            wait=wait_exponential_jitter(initial=0.5, max=8),
+            before_sleep=lambda state: logger.warning(
+                "GitHub request failed (%s); retrying", state.outcome.exception()
+            ),
+            reraise=True,
+        )
+
+    def call(self, fn, *args, **kwargs):
+        """Call ``fn(*args, **kwargs)`` with retry and exponential backoff."""
+        return self._retrying(is_retryable)(fn, *args, **kwargs)
+
+    def write(self, fn, *args, **kwargs):
+        """Call a non-idempotent ``fn``, retrying only rate-limit rejections."""
+        return self._retrying(is_rate_limited)(fn, *args, **kwargs)
+
+    @property
+    def repo(self):
+        with self._lock:
+            if self._repo is None:
+                self._repo = self.call(self.github.get_repo, self.repo_full_name)
+            return self._repo
+
+    @property
+    def remaining(self):
+        """Requests left in the current window, or None before the first response."""
+        remaining, limit = self.github.requester.rate_limiting
+        return remaining if limit >= 0 else None
+
+    @property
+    def quota_low(self):
+        remaining = self.remaining
+        return remaining is not None and remaining < self.low_quota
@@ -0,0 +1,186 @@
+# Streaming, validating ingestion of uploaded placement files.
+#
+# Uploads are read CHUNKSIZE rows at a time.  The header is checked against
+# REQUIRED_COLS on the first chunk (so an invalid file is rejected before
+# anything is stored), every chunk is projected to REQUIRED_COLS and coerced
+# to the expected types, and rows that fail coercion are reported with their
+# line number and dropped.  Cleaned rows are spooled to a CSV temp file; only
+# one chunk is held in memory at a time.
+import tempfile
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from hirelytics import metrics
+from hirelytics.schema import REQUIRED_COLS, normalize_frame
+
+CHUNKSIZE = 50_000
+MAX_REPORTED_ERRORS = 500
+SPOOL_SIZE = 8 * 1024 * 1024
+
+INTERNSHIP_VALUES = {
+    "yes": "Yes", "y": "Yes", "true": "Yes", "1": "Yes",
+    "no": "No", "n": "No", "false": "No", "0": "No",
+}
+
+
+class IngestError(ValueError):
+    """The upload cannot be ingested at all (bad header, no valid rows)."""
+
+
+@dataclass(frozen=True)
+class RowError:
+    line: int
+    column: str
+    value: object
+    message: str
+
+
+@dataclass
+class IngestResult:
+    csv: object                       # spooled file with the cleaned CSV
+    rows: int = 0
+    error_count: int = 0
+    errors: list = field(default_factory=list)
+
+    def close(self):
+        self.csv.close()
+
+
+def check_header(columns, required=REQUIRED_COLS):
+    columns = [str(col).strip() for col in columns]
+    missing = [col for col in required if col not in columns]
+    if missing:
+        raise IngestError(f"Missing required columns: {', '.join(missing)}")
+    return columns
+
+
+def _iter_xlsx(fileobj, chunksize, required=REQUIRED_COLS):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            raise IngestError("The uploaded file is empty.")
+        columns = check_header(["" if col is None else col for col in header], required)
+        batch = []
+        for row in rows:
+            batch.append(row[:len(columns)])
+            if len(batch) == chunksize:
+                yield pd.DataFrame.from_records(batch, columns=columns)
+                batch = []
+        if batch:
+            yield pd.DataFrame.from_records(batch, columns=columns)
+    finally:
+        workbook.close()
+
+
+def _iter_csv(fileobj, chunksize, required=REQUIRED_COLS):
+    reader = pd.read_csv(fileobj, chunksize=chunksize, dtype=str, keep_default_na=False, skip_blank_lines=False)
+    first = True
+    for chunk in reader:
+        if first:
+            chunk.columns = check_header(chunk.columns, required)
+            first = False
+        else:
+            chunk.columns = chunk.columns.str.strip()
+        yield chunk
+    if first:
+        raise IngestError("The uploaded file is empty.")
+
+
+def iter_chunks(fileobj, name, chunksize=CHUNKSIZE, required=REQUIRED_COLS):
+    """Yield raw DataFrame chunks of an uploaded .csv or .xlsx file.
+
+    The header must contain every column in ``required``.
+    """
+    try:
+        if name.lower().endswith(".xlsx"):
+            yield from _iter_xlsx(fileobj, chunksize, required)
+        else:
+            yield from _iter_csv(fileobj, chunksize, required)
+    except pd.errors.EmptyDataError:
+        raise IngestError("The uploaded file is empty.") from None
+
+
+def _blank(series):
+    return series.isna() | (series.astype(str).str.strip() == "")
+
+
+def clean_chunk(chunk, first_line):
+    """Coerce a raw chunk; return ``(clean_frame, [RowError, ...])``.
+
+    ``first_line`` is the file line number of the chunk's first row.  Errors
+    are in line order.
+    """
+    chunk = chunk[REQUIRED_COLS].reset_index(drop=True)
+    lines = np.arange(first_line, first_line + len(chunk))
+    # Blank lines are kept while reading so line numbers stay exact; drop
+    # them here without reporting an error.
+    bad = np.logical_and.reduce([_blank(chunk[col]).to_numpy() for col in REQUIRED_COLS])
+    errors = []
+
+    def flag(mask, column, message):
+        mask = np.asarray(mask, dtype=bool) & ~bad
+        for i in np.flatnonzero(mask):
+            errors.append(RowError(int(lines[i]), column, chunk.at[i, column], message))
+        bad[mask] = True
+
+    numbers = {}
+    for column, low, high in (("CGPA", 0.0, 10.0), ("Package", 0.0, None), ("Year", 1900, 2200)):
+        values = pd.to_numeric(chunk[column], errors="coerce")
+        flag(values.isna() & ~_blank(chunk[column]), column, "not a number")
+        flag(_blank(chunk[column]), column, "missing value")
+        out_of_range = (values < low) | ((values > high) if high is not None else False)
+        flag(out_of_range.fillna(False), column, "out of range")
+        numbers[column] = values
+    flag((numbers["Year"] % 1 != 0).fillna(False), "Year", "not a whole year")
+
+    internship = chunk["Internship"].astype(str).str.strip().str.lower().map(INTERNSHIP_VALUES)
+    flag(internship.isna(), "Internship", "must be Yes or No")
+
+    clean = chunk.assign(
+        CGPA=numbers["CGPA"], Package=numbers["Package"], Year=numbers["Year"], Internship=internship,
+    )
+    clean = normalize_frame(clean.loc[~bad])
+    # Checks run column by column; report in file order (stable within a line)
+    errors.sort(key=lambda error: error.line)
+    return clean, errors
+
+
+@metrics.timed("ingest")
+def ingest(fileobj, name, chunksize=CHUNKSIZE, max_errors=MAX_REPORTED_ERRORS):
+    """Validate and clean an upload into a spooled CSV.
+
+    Raises IngestError if the header is invalid or no row survives cleaning.
+    At most ``max_errors`` RowErrors are kept; ``error_count`` has the total.
+    """
+    result = IngestResult(csv=tempfile.SpooledTemporaryFile(max_size=SPOOL_SIZE, mode="w+b"))
+    try:
+        line = 2  # line 1 is the header
+        for chunk in iter_chunks(fileobj, name, chunksize):
+            clean, errors = clean_chunk(chunk, line)
+            metrics.incr("rows_parsed", len(chunk))
+            line += len(chunk)
+            result.error_count += len(errors)
+            result.errors.extend(errors[:max_errors - len(result.errors)])
+            result.csv.write(clean.to_csv(index=False, header=result.csv.tell() == 0).encode("utf-8"))
+            result.rows += len(clean)
+        if result.rows == 0:
+            raise IngestError("No valid rows found in the uploaded file.")
+        result.csv.seek(0)
+        return result
+    except BaseException:
+        result.close()
+        raise
+
+
+def iter_clean_frames(result, chunksize=CHUNKSIZE):
+    """Re-read the cleaned CSV of ``result`` as typed frames, one chunk at a time."""
+    result.csv.seek(0)
+    for chunk in pd.read_csv(result.csv, chunksize=chunksize):
+        yield normalize_frame(chunk)
+    result.csv.seek(0)
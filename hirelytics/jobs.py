@@ -0,0 +1,190 @@
+# In-process job service for the heavy per-request work.
+#
+# Model fitting, PDF text extraction, resume matching, resume rendering,
+# placement reports, batch screening, cohort scoring and cross-college
+# refreshes are submitted here instead of running inline on a session's
+# script thread.  Every kind of
+# job has its own executor, whose size is that kind's concurrency limit.
+# Pure-Python CPU work (PDF parsing, rendering) runs in worker processes, so
+# its throughput scales with cores rather than with the number of Streamlit
+# threads.  Jobs with the same key are coalesced, and finished jobs are kept
+# for RESULT_TTL seconds so pages can poll them by id across reruns.
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import CancelledError, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from cachetools import TTLCache
+
+from hirelytics import metrics
+
+logger = logging.getLogger(__name__)
+
+THREAD = "thread"
+PROCESS = "process"
+CPUS = os.cpu_count() or 1
+
+# kind -> (executor type, max concurrent jobs)
+DEFAULT_KINDS = {
+    "fit": (THREAD, 4),            # sklearn/numpy release the GIL; training data stays shared
+    "match": (THREAD, 4),          # rapidfuzz releases the GIL
+    "pdf_text": (PROCESS, CPUS),
+    "render": (PROCESS, CPUS),
+    "report": (THREAD, 2),         # reads the shared frame; small output, rarely requested
+    "analytics": (THREAD, 1),      # cross-college refresh; loads colleges concurrently itself
+    "cohort": (THREAD, 1),         # cohort scoring; fits skill sets on its own thread pool
+    "screening": (THREAD, 2),      # batch screening; resumes go to the pdf_text pool
+}
+RESULT_TTL = 600
+MAX_JOBS = 4096
+
+
+def _timed_call(fn, *args, **kwargs):
+    # Runs in the worker; the run time travels back with the result.
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+class Job:
+    """Handle to a submitted computation; poll ``status`` or wait on ``result``."""
+
+    def __init__(self, kind, key, future):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.key = key
+        self.future = future
+        self.submitted_at = time.time()
+        self.run_seconds = None
+
+    @property
+    def status(self):
+        """One of "queued", "running", "done", "failed" or "cancelled"."""
+        future = self.future
+        if future.cancelled():
+            return "cancelled"
+        if not future.done():
+            return "running" if future.running() else "queued"
+        return "failed" if future.exception() is not None else "done"
+
+    def done(self):
+        return self.future.done()
+
+    def wait(self, timeout=None):
+        """Block for up to ``timeout`` seconds; True if the job has finished."""
+        wait([self.future], timeout)
+        return self.future.done()
+
+    def result(self, timeout=None):
+        """The job's return value; the first caller adds its run time to the current trace."""
+        seconds, value = self.future.result(timeout)
+        if self.run_seconds is None:
+            self.run_seconds = seconds
+            metrics.record_span(f"job.{self.kind}", seconds)
+        return value
+
+
+def mp_context():
+    """Start method for worker pools created inside the Streamlit server.
+
+    Forking a process that already runs server threads is unsafe (children
+    inherit locks and thread pools whose threads do not exist), so workers
+    are started from a clean server process where possible.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class JobService:
+    def __init__(self, kinds=None, result_ttl=RESULT_TTL, max_jobs=MAX_JOBS):
+        self.kinds = dict(DEFAULT_KINDS if kinds is None else kinds)
+        self._executors = {}
+        self._jobs = TTLCache(maxsize=max_jobs, ttl=result_ttl)
+        self._by_key = TTLCache(maxsize=max_jobs, ttl=result_ttl)
+        self._lock = threading.Lock()
+
+    def _executor(self, kind):
+        executor = self._executors.get(kind)
+        if executor is None:
+            mode, workers = self.kinds[kind]
+            if mode == PROCESS:
+                executor = ProcessPoolExecutor(max_workers=workers, mp_context=mp_context())
+            else:
+                executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"job-{kind}")
+            self._executors[kind] = executor
+        return executor
+
+    def executor(self, kind):
+        """The shared executor of ``kind``, for jobs that fan work out to its pool."""
+        with self._lock:
+            return self._executor(kind)
+
+    def submit(self, kind, fn, *args, key=None, **kwargs):
+        """Run ``fn(*args, **kwargs)`` as a ``kind`` job and return its Job.
+
+        If a job with the same ``(kind, key)`` is queued, running, or finished
+        successfully within the result TTL, that job is returned instead.
+        Process jobs need picklable, module-level ``fn`` and arguments.
+        """
+        with self._lock:
+            if key is not None:
+                job = self._jobs.get(self._by_key.get((kind, key)))
+                if job is not None and job.status not in ("failed", "cancelled"):
+                    metrics.incr("jobs_coalesced")
+                    return job
+            job = Job(kind, key, self._executor(kind).submit(_timed_call, fn, *args, **kwargs))
+            self._jobs[job.id] = job
+            if key is not None:
+                self._by_key[(kind, key)] = job.id
+        metrics.incr("jobs_submitted")
+        job.future.add_done_callback(lambda f: self._log_failure(job))
+        return job
+
+    def _log_failure(self, job):
+        try:
+            error = job.future.exception()
+        except CancelledError:
+            return
+        if error is not None:
+            metrics.incr("jobs_failed")
+            logger.warning("%s job %s failed", job.kind, job.id, exc_info=error)
+
+    def get(self, job_id):
+        """The Job with ``job_id``, or None if unknown or expired."""
+        if job_id is None:
+            return None
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self):
+        """Queued/running job counts per kind."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+        counts = {kind: {"queued": 0, "running": 0} for kind in self.kinds}
+        for job in jobs:
+            status = job.status
+            if status in ("queued", "running"):
+                counts[job.kind][status] += 1
+        return counts
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executors, self._executors = self._executors, {}
+        for executor in executors.values():
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def job_service():
+    """The process-wide JobService, created on first use."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = JobService()
+        return _service
@@ -0,0 +1,255 @@
+# Lightweight timing spans and counters for the page hot paths.
+#
+# Every span and counter updates process-wide totals, exportable in the
+# Prometheus text format, and -- when the page has started a trace for the
+# current rerun -- that trace as well, so admins can see where a single
+# rerun's time went.  Finished traces are logged as one JSON record each.
+# Work done in job workers runs outside the page's trace; the job's run time
+# is added to the trace of the rerun that collects its result.
+import contextvars
+import functools
+import json
+import logging
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "hirelytics"
+
+_current = contextvars.ContextVar("hirelytics_trace", default=None)
+
+
+def rss_bytes():
+    """Resident set size of this process, or None where it cannot be read."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+@dataclass
+class SpanRecord:
+    name: str
+    depth: int
+    start: float      # seconds since the trace started
+    duration: float
+
+
+class Trace:
+    """Spans and counters recorded during one page rerun."""
+
+    def __init__(self, label):
+        self.label = label
+        self.started = time.perf_counter()
+        self.duration = None
+        self.rss_start = rss_bytes()
+        self.rss_end = None
+        self.spans = []
+        self.counters = {}
+        self._depth = 0
+
+    def finish(self):
+        if self.duration is None:
+            self.duration = time.perf_counter() - self.started
+            self.rss_end = rss_bytes()
+        return self
+
+    def as_dict(self):
+        return {
+            "trace": self.label,
+            "duration_s": round(self.duration, 6) if self.duration is not None else None,
+            "rss_start": self.rss_start,
+            "rss_end": self.rss_end,
+            "spans": [
+                {"name": s.name, "depth": s.depth, "start_s": round(s.start, 6), "duration_s": round(s.duration, 6)}
+                for s in self.spans
+            ],
+            "counters": dict(self.counters),
+        }
+
+
+class Metrics:
+    """Thread-safe process-wide counter and span totals."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {}
+        self.spans = {}     # name -> [count, total seconds, max seconds]
+
+    def incr(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, seconds):
+        with self._lock:
+            totals = self.spans.setdefault(name, [0, 0.0, 0.0])
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] = max(totals[2], seconds)
+
+    def prometheus_text(self, prefix=PREFIX):
+        with self._lock:
+            counters = sorted(self.counters.items())
+            spans = sorted((name, list(totals)) for name, totals in self.spans.items())
+        lines = []
+        for name, value in counters:
+            metric = f"{prefix}_{_metric_name(name)}_total"
+            lines += [f"# TYPE {metric} counter", f"{metric} {value}"]
+        if spans:
+            metric = f"{prefix}_span_seconds"
+            lines.append(f"# TYPE {metric} summary")
+            for name, (count, total, _) in spans:
+                lines.append(f'{metric}_count{{span="{_label(name)}"}} {count}')
+                lines.append(f'{metric}_sum{{span="{_label(name)}"}} {total:.6f}')
+            lines.append(f"# TYPE {prefix}_span_max_seconds gauge")
+            for name, (_, _, peak) in spans:
+                lines.append(f'{prefix}_span_max_seconds{{span="{_label(name)}"}} {peak:.6f}')
+        rss = rss_bytes()
+        if rss is not None:
+            lines += [f"# TYPE {prefix}_resident_memory_bytes gauge", f"{prefix}_resident_memory_bytes {rss}"]
+        return "\n".join(lines) + "\n"
+
+
+def _metric_name(name):
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def _label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+metrics = Metrics()
+
+
+def incr(name, value=1):
+    """Add ``value`` to counter ``name`` (process totals and the current trace)."""
+    metrics.incr(name, value)
+    trace = _current.get()
+    if trace is not None:
+        trace.counters[name] = trace.counters.get(name, 0) + value
+
+
+@contextmanager
+def span(name):
+    """Time the enclosed block as ``name``."""
+    trace = _current.get()
+    depth = 0
+    if trace is not None:
+        depth = trace._depth
+        trace._depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        metrics.observe(name, duration)
+        if trace is not None:
+            trace._depth = depth
+            trace.spans.append(SpanRecord(name, depth, start - trace.started, duration))
+
+
+def record_span(name, seconds):
+    """Add work timed elsewhere (a job in a worker) to the current trace as ``name``.
+
+    Process totals are left alone; the work's own spans count there.
+    """
+    trace = _current.get()
+    if trace is not None:
+        start = max(time.perf_counter() - trace.started - seconds, 0.0)
+        trace.spans.append(SpanRecord(name, trace._depth, start, seconds))
+
+
+def timed(name):
+    """Decorator form of ``span``."""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def start_trace(label):
+    """Begin recording spans for the current rerun and return its Trace."""
+    trace = Trace(label)
+    _current.set(trace)
+    return trace
+
+
+def current_trace():
+    return _current.get()
+
+
+def finish_trace(trace=None):
+    """Close ``trace`` (default: the current one) and log it as a JSON record."""
+    trace = trace or _current.get()
+    if trace is None:
+        return None
+    trace.finish()
+    if _current.get() is trace:
+        _current.set(None)
+    logger.info(json.dumps(trace.as_dict()))
+    return trace
+
+
+def prometheus_text():
+    return metrics.prometheus_text()
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def serve_prometheus(port, host="127.0.0.1"):
+    """Serve ``prometheus_text()`` at ``http://host:port/metrics`` from a daemon thread."""
+    global _server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = prometheus_text().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            logger.debug(format, *args)
+
+    with _server_lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host, port), Handler)
+            threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+            logger.info("Serving metrics on http://%s:%d/metrics", host, port)
+        return _server
+
+
+_configured = set()
+
+
+def configure(secrets):
+    """Start the metrics endpoint if ``[metrics] port`` is set in the app secrets.
+
+    Called on every rerun; the endpoint is only started (or attempted) once.
+    """
+    config = secrets.get("metrics", {})
+    if config.get("port"):
+        with _server_lock:
+            if config["port"] in _configured:
+                return
+            _configured.add(config["port"])
+        try:
+            serve_prometheus(int(config["port"]), config.get("host", "127.0.0.1"))
+        except OSError:
+            logger.warning("Could not start the metrics endpoint", exc_info=True)
@@ -0,0 +1,207 @@
+# Placement prediction models, trained once per dataset version.
+#
+# Fitting a LogisticRegression on every Predict click is wasteful: the model
+# only depends on the dataset and on the set of skills the student entered.
+# ModelRegistry keys fitted models by (college code, dataset SHA, skill-set
+# signature) and keeps the most recently used ones.
+import logging
+import threading
+
+import numpy as np
+import pandas as pd
+from cachetools import LRUCache
+
+from hirelytics import metrics
+from hirelytics.skills import SkillIndex, split_skills
+
+logger = logging.getLogger(__name__)
+
+FEATURES = ['CGPA', 'InternshipEncoded', 'SkillMatch']
+
+# Probability grid: CGPA 0.0-10.0 in 0.1 steps x Internship x SkillMatch count
+CGPA_GRID = np.round(np.linspace(0.0, 10.0, 101), 1)
+
+
+def parse_user_skills(skills_input):
+    return split_skills(skills_input)
+
+
+def skill_signature(user_skills):
+    return tuple(sorted(set(user_skills)))
+
+
+class TrainingSet:
+    """Per-dataset features that do not depend on the student's input."""
+
+    def __init__(self, df, skill_index=None):
+        self.cgpa = df['CGPA'].to_numpy(dtype=float)
+        self.internship = (df['Internship'] == 'Yes').to_numpy(dtype=int)
+        self.placed = (df['Package'] > 0).to_numpy(dtype=int)
+        self.skills = skill_index if skill_index is not None else SkillIndex.from_frame(df)
+
+    def skill_match(self, user_skills):
+        return self.skills.match_counts(user_skills)
+
+    def features(self, user_skills):
+        return pd.DataFrame({
+            'CGPA': self.cgpa,
+            'InternshipEncoded': self.internship,
+            'SkillMatch': self.skill_match(user_skills),
+        })
+
+
+class PlacementModel:
+    """A fitted estimator plus its precomputed probability grid.
+
+    ``grid[c, i, s]`` is the placement probability at CGPA ``CGPA_GRID[c]``,
+    internship ``i`` (0/1) and SkillMatch ``s``; it is computed with a single
+    ``predict_proba`` call so on-grid predictions need no model call.
+    """
+
+    def __init__(self, estimator, max_skill_match=0):
+        self.estimator = estimator
+        cgpa, internship, skill_match = np.meshgrid(
+            CGPA_GRID, [0, 1], np.arange(max_skill_match + 1), indexing="ij"
+        )
+        grid_input = pd.DataFrame({
+            'CGPA': cgpa.ravel(),
+            'InternshipEncoded': internship.ravel(),
+            'SkillMatch': skill_match.ravel(),
+        })
+        self.grid = estimator.predict_proba(grid_input)[:, 1].reshape(cgpa.shape)
+
+    def _grid_index(self, cgpa, skill_match):
+        step = round(cgpa * 10)
+        if abs(cgpa * 10 - step) > 1e-6 or not 0 <= step < len(CGPA_GRID):
+            return None
+        if not 0 <= skill_match < self.grid.shape[2]:
+            return None
+        return step, int(skill_match)
+
+    def predict(self, cgpa, internship, skill_match):
+        """Return ``(prediction, probability_of_placement)`` for one student."""
+        index = self._grid_index(cgpa, skill_match)
+        if index is not None:
+            prob = self.grid[index[0], 1 if internship == "Yes" else 0, index[1]]
+            # LogisticRegression predicts the positive class only above 0.5
+            return int(prob > 0.5), prob
+        user_input = pd.DataFrame([{
+            'CGPA': cgpa,
+            'InternshipEncoded': 1 if internship == "Yes" else 0,
+            'SkillMatch': skill_match,
+        }])
+        prediction = self.estimator.predict(user_input)[0]
+        prob = self.estimator.predict_proba(user_input)[0][1]
+        return prediction, prob
+
+    def predict_proba_many(self, cgpa, internship, skill_match):
+        """Placement probabilities for arrays of students (``internship`` as 0/1).
+
+        On-grid rows are read from the grid; the rest go through one
+        ``predict_proba`` call.  Inputs must not contain NaN.
+        """
+        cgpa = np.asarray(cgpa, dtype=float)
+        internship = np.asarray(internship, dtype=int)
+        skill_match = np.asarray(skill_match, dtype=int)
+        steps = np.round(cgpa * 10)
+        on_grid = (
+            (np.abs(cgpa * 10 - steps) <= 1e-6) & (steps >= 0) & (steps < len(CGPA_GRID))
+            & (skill_match >= 0) & (skill_match < self.grid.shape[2])
+        )
+        probs = np.empty(len(cgpa))
+        probs[on_grid] = self.grid[steps[on_grid].astype(int), internship[on_grid], skill_match[on_grid]]
+        off_grid = ~on_grid
+        if off_grid.any():
+            probs[off_grid] = self.estimator.predict_proba(pd.DataFrame({
+                'CGPA': cgpa[off_grid],
+                'InternshipEncoded': internship[off_grid],
+                'SkillMatch': skill_match[off_grid],
+            }))[:, 1]
+        return probs
+
+    def surface(self, internship):
+        """Long-form ``CGPA, SkillMatch, Probability`` frame for one internship value."""
+        probs = self.grid[:, 1 if internship == "Yes" else 0, :]
+        return pd.DataFrame({
+            'CGPA': np.repeat(CGPA_GRID, probs.shape[1]),
+            'SkillMatch': np.tile(np.arange(probs.shape[1]), len(CGPA_GRID)),
+            'Probability': probs.ravel(),
+        })
+
+
+@metrics.timed("fit_model")
+def fit_model(training, user_skills):
+    """Fit a model for ``user_skills``, or return None if labels are not diverse."""
+    from sklearn.linear_model import LogisticRegression
+
+    if len(np.unique(training.placed)) < 2:
+        return None
+    features = training.features(user_skills)
+    model = LogisticRegression()
+    model.fit(features, training.placed)
+    return PlacementModel(model, max_skill_match=max(len(user_skills), int(features['SkillMatch'].max())))
+
+
+class ModelRegistry:
+    """LRU cache of fitted models and of the per-dataset training sets."""
+
+    def __init__(self, maxsize=128, max_datasets=16):
+        self._lock = threading.Lock()
+        self._models = LRUCache(maxsize=maxsize)
+        self._training = LRUCache(maxsize=max_datasets)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate,
+                "models": len(self._models), "datasets": len(self._training)}
+
+    def training_set(self, college_code, dataset_sha, df, skill_index=None):
+        key = (college_code, dataset_sha)
+        with self._lock:
+            training = self._training.get(key)
+        if training is None:
+            training = TrainingSet(df, skill_index)
+            with self._lock:
+                self._training[key] = training
+        return training
+
+    def get(self, college_code, dataset_sha, df, user_skills, skill_index=None, store=True):
+        """Return the fitted PlacementModel (or None) for this dataset and skill set.
+
+        With ``store=False`` a newly fitted model is not cached, so bulk
+        callers (cohort scoring) do not evict the Student page's models.
+        """
+        key = (college_code, dataset_sha, skill_signature(user_skills))
+        with self._lock:
+            if key in self._models:
+                self.hits += 1
+                metrics.incr("model_cache_hits")
+                return self._models[key]
+        training = self.training_set(college_code, dataset_sha, df, skill_index)
+        model = fit_model(training, user_skills)
+        with self._lock:
+            self.misses += 1
+            metrics.incr("model_cache_misses")
+            if store:
+                self._models[key] = model
+            logger.info("Trained placement model for %s (hit rate %.0f%%)", college_code, 100 * self.hit_rate)
+        return model
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def shared_model_registry():
+    """The process-wide ModelRegistry, shared by the Student and Admin pages."""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = ModelRegistry()
+        return _registry
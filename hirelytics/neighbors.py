@@ -0,0 +1,91 @@
+# "Students like me": nearest placed students by CGPA, internship and skills.
+#
+# The index is built once per dataset version (it lives in the shared content
+# cache under the dataset SHA) and holds only the placed students: a
+# row-normalized sparse skill matrix plus plain arrays for CGPA, internship
+# and the Company/Package/Year to report.  A query is one sparse
+# matrix-vector product and a few vectorized array operations -- no pass over
+# the DataFrame -- followed by an argpartition for the top k.
+#
+# Similarity is a weighted sum of the skill-set cosine, CGPA closeness (1 at
+# the same CGPA, 0 at CGPA_RANGE or more apart) and whether the internship
+# status matches.  Skills are sparse and high-dimensional, where KD/ball trees
+# degrade to a scan anyway; the sparse cosine keeps the cost proportional to
+# the number of listed skills.
+import numpy as np
+import pandas as pd
+
+from hirelytics import metrics
+
+W_SKILLS = 0.5
+W_CGPA = 0.35
+W_INTERNSHIP = 0.15
+CGPA_RANGE = 2.0
+
+NEIGHBOR_COLS = ['CGPA', 'Internship', 'Skills', 'Package', 'Company', 'Year']
+RESULT_COLS = ['Company', 'Package', 'Year', 'CGPA', 'Internship', 'Similarity']
+
+
+class NeighborIndex:
+    def __init__(self, skill_index, skills, cgpa, internship, company, package, year):
+        self.skill_index = skill_index    # SkillIndex of the full dataset (for the vocabulary)
+        self.skills = skills              # CSR, placed students x vocabulary, unit-length rows
+        self.cgpa = cgpa
+        self.internship = internship      # bool
+        self.company = company
+        self.package = package
+        self.year = year
+
+    @classmethod
+    @metrics.timed("neighbor_index")
+    def from_frame(cls, df, skill_index):
+        from scipy import sparse
+
+        placed = (df['Package'] > 0).to_numpy()
+        matrix = skill_index.matrix[placed].astype(np.float32)
+        norms = np.sqrt(np.asarray(matrix.sum(axis=1)).ravel())  # entries are 0/1
+        matrix = sparse.csr_matrix(sparse.diags(1.0 / np.where(norms > 0, norms, 1.0)) @ matrix)
+        return cls(
+            skill_index,
+            matrix,
+            df['CGPA'].to_numpy(dtype=np.float32)[placed],
+            (df['Internship'] == 'Yes').to_numpy()[placed],
+            df['Company'].to_numpy(dtype=object)[placed],
+            df['Package'].to_numpy(dtype=np.float32)[placed],
+            df['Year'].to_numpy(dtype=object)[placed],
+        )
+
+    def __len__(self):
+        return len(self.cgpa)
+
+    def scores(self, cgpa, internship, user_skills):
+        """Similarity of every indexed student to the given profile."""
+        query = self.skill_index.skill_vector(user_skills).astype(np.float32)
+        norm = np.sqrt(query.sum())
+        skill_sim = self.skills @ (query / norm) if norm > 0 else np.zeros(len(self), dtype=np.float32)
+        cgpa_sim = 1.0 - np.minimum(np.abs(self.cgpa - cgpa), CGPA_RANGE) / CGPA_RANGE
+        internship_sim = self.internship == (internship == "Yes")
+        return W_SKILLS * skill_sim + W_CGPA * cgpa_sim + W_INTERNSHIP * internship_sim
+
+    def query(self, cgpa, internship, user_skills, k=10):
+        """The ``k`` most similar placed students, most similar first."""
+        if len(self) == 0:
+            return pd.DataFrame(columns=RESULT_COLS)
+        scores = self.scores(cgpa, internship, user_skills)
+        k = min(k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.lexsort((-self.package[top], -scores[top]))]
+        # Rounded so float32 storage does not show as 7.300000190734863
+        return pd.DataFrame({
+            'Company': self.company[top],
+            'Package': self.package[top].astype(float).round(2),
+            'Year': self.year[top],
+            'CGPA': self.cgpa[top].astype(float).round(2),
+            'Internship': np.where(self.internship[top], 'Yes', 'No'),
+            'Similarity': scores[top],
+        })
+
+
+def neighbor_index_for(cache, dataset_sha, df, skill_index):
+    """The dataset's NeighborIndex, built once per SHA in the shared content cache."""
+    return cache.derived(dataset_sha, "neighbors", lambda: NeighborIndex.from_frame(df, skill_index))
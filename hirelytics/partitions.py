@@ -0,0 +1,141 @@
+# Year-partitioned placement datasets with incremental append/merge.
+#
+# Instead of one file per college, appended data is stored as one Arrow IPC
+# partition per Year plus a small JSON manifest recording each partition's
+# blob SHA.  An append rewrites only the years present in the upload, and
+# readers fetch partitions by SHA, so unchanged partitions come straight from
+# the content cache.
+import json
+from dataclasses import dataclass
+
+import pandas as pd
+
+from hirelytics.schema import REQUIRED_COLS, compact_dtypes, normalize_frame
+from hirelytics.snapshot import frame_to_ipc, read_snapshot
+
+DEFAULT_DEDUP_KEY = REQUIRED_COLS
+UNKNOWN_YEAR = "unknown"         # partition label for rows without a Year
+
+
+def manifest_path(college_code):
+    return f"placement_data_{college_code}.manifest.json"
+
+
+def partition_path(college_code, year):
+    return f"placement_data_{college_code}/year={year}.arrow"
+
+
+@dataclass(frozen=True)
+class Manifest:
+    sha: str                 # blob SHA of the manifest itself (the dataset version)
+    dedup_key: list
+    partitions: dict         # year label -> {"path", "sha", "rows"}
+
+    @property
+    def years(self):
+        return sorted(self.partitions)
+
+    @property
+    def rows(self):
+        return sum(p["rows"] for p in self.partitions.values())
+
+
+def load_manifest(storage, college_code):
+    stored = storage.get(manifest_path(college_code))
+    if stored is None:
+        return None
+
+    def parse():
+        content = json.loads(stored.data)
+        return Manifest(stored.sha, content["dedup_key"], content["partitions"])
+
+    return storage.cache.derived(stored.sha, "manifest", parse)
+
+
+def load_partition(storage, manifest, year):
+    """Return ``(sha, frame)`` of one year's partition (read-only, shared)."""
+    entry = manifest.partitions[str(year)]
+    stored = storage.get_blob(entry["path"], entry["sha"])
+    table, df = storage.cache.derived(stored.sha, "snapshot", lambda: read_snapshot(storage, stored))
+    return stored.sha, df
+
+
+def load_partitioned_frame(storage, manifest):
+    """Concatenate every partition of ``manifest`` into one frame."""
+    def build():
+        frames = [load_partition(storage, manifest, year)[1] for year in manifest.years]
+        if not frames:
+            return compact_dtypes(normalize_frame(pd.DataFrame(columns=REQUIRED_COLS)))
+        # Partitions have different categories; concat falls back to object
+        # columns, so re-compact the combined frame.
+        return compact_dtypes(pd.concat(frames, ignore_index=True))
+
+    return storage.cache.derived(manifest.sha, "frame", build)
+
+
+def write_manifest(storage, college_code, dedup_key, partitions, message="Update placement manifest"):
+    content = json.dumps({"dedup_key": list(dedup_key), "partitions": partitions}, indent=2, sort_keys=True)
+    return storage.put(manifest_path(college_code), content, message)
+
+
+def merge_rows(old, new, dedup_key):
+    """``old`` rows whose key is not in ``new``, followed by all of ``new``."""
+    if old is None or old.empty:
+        return new.reset_index(drop=True)
+    if not dedup_key:
+        return pd.concat([old, new], ignore_index=True)
+    old_keys = pd.MultiIndex.from_frame(old[dedup_key].astype(str))
+    new_keys = pd.MultiIndex.from_frame(new[dedup_key].astype(str))
+    return pd.concat([old[~old_keys.isin(new_keys)], new], ignore_index=True)
+
+
+def _by_year(df):
+    # Rows without a usable Year (data stored before uploads were validated)
+    # keep their own partition instead of being dropped.
+    labels = df['Year'].astype(str).where(df['Year'].notna(), UNKNOWN_YEAR)
+    return dict(tuple(df.groupby(labels)))
+
+
+def append_partitions(storage, college_code, new_df, dedup_key=None, existing_df=None):
+    """Merge ``new_df`` into the college's partitions and return the new manifest SHA.
+
+    Existing rows whose ``dedup_key`` columns match a new row are replaced.
+    Only the years present in ``new_df`` (or in ``existing_df``, which seeds
+    the partitions when the college still uses the single-file layout) are
+    rewritten.
+    """
+    manifest = load_manifest(storage, college_code)
+    partitions = dict(manifest.partitions) if manifest is not None else {}
+    if dedup_key is None:
+        dedup_key = manifest.dedup_key if manifest is not None else DEFAULT_DEDUP_KEY
+    dedup_key = list(dedup_key)
+
+    new_years = _by_year(normalize_frame(new_df))
+    seed_years = _by_year(normalize_frame(existing_df)) if existing_df is not None else {}
+
+    for year in sorted(set(new_years) | set(seed_years)):
+        if year in partitions:
+            # The shared partition frame is compact (float32); normalize it so
+            # concat with the new float64 rows keeps the stored decimals.
+            old = normalize_frame(load_partition(storage, manifest, year)[1])
+        else:
+            old = seed_years.get(year)
+        new = new_years.get(year)
+        if new is None:
+            new = old.iloc[:0]
+        part = merge_rows(old, new, dedup_key)
+        path = partition_path(college_code, year)
+        sha = storage.put(path, frame_to_ipc(part), f"Update placement data for {year}")
+        partitions[year] = {"path": path, "sha": sha, "rows": len(part)}
+
+    return write_manifest(storage, college_code, dedup_key, partitions)
+
+
+def delete_partitions(storage, college_code):
+    manifest = load_manifest(storage, college_code)
+    if manifest is None:
+        return False
+    for entry in manifest.partitions.values():
+        storage.delete(entry["path"], "Delete placement data")
+    storage.delete(manifest_path(college_code), "Delete placement manifest")
+    return True
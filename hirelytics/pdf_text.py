@@ -0,0 +1,109 @@
+# Resume PDF text extraction.
+#
+# Pages are extracted serially with a single PdfReader and yielded in page
+# order.  PyPDF2 is pure Python and holds the GIL, so threads would only add
+# overhead; parallelism comes from running extractions in the job service's
+# worker processes.  Page/byte limits and an overall timeout keep one
+# oversized or pathological upload from tying up a worker.  Extraction runs
+# in pool workers, where a per-process cache would only help when a file
+# happened to land on the same worker again, so the joined text is cached in
+# the server process instead (cached_text/remember_text, keyed by the hash
+# the page already computes for the upload).
+import io
+import signal
+import threading
+import time
+from contextlib import contextmanager
+
+from cachetools import LRUCache
+
+from hirelytics import metrics
+
+MAX_BYTES = 10 * 1024 * 1024
+MAX_PAGES = 30
+TIMEOUT = 30.0
+
+_texts = LRUCache(maxsize=256)
+_texts_lock = threading.Lock()
+
+
+def _reader(data):
+    from PyPDF2 import PdfReader
+
+    return PdfReader(io.BytesIO(data))
+
+
+def _timeout_error(timeout):
+    return TimeoutError(f"PDF text extraction took longer than {timeout:g} s.")
+
+
+@contextmanager
+def _hard_deadline(timeout):
+    # A single pathological page can run far past the deadline checked
+    # between pages.  Where signals are available (the main thread of a job
+    # worker process or the CLI), SIGALRM interrupts it mid-page.
+    if not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def expire(signum, frame):
+        raise _timeout_error(timeout)
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def iter_page_texts(data, max_pages=MAX_PAGES, max_bytes=MAX_BYTES, timeout=TIMEOUT):
+    """Yield ``(page_number, page_count, text)`` for each page of the PDF ``data``.
+
+    Raises ValueError when the file is not a readable PDF or exceeds
+    ``max_bytes``/``max_pages``, and TimeoutError when extraction takes
+    longer than ``timeout`` seconds (checked between pages).
+    """
+    from PyPDF2.errors import PyPdfError
+
+    if len(data) > max_bytes:
+        raise ValueError(f"PDF is larger than {max_bytes // (1024 * 1024)} MB.")
+    deadline = time.monotonic() + timeout
+    try:
+        pages = _reader(data).pages
+        page_count = len(pages)
+        if page_count > max_pages:
+            raise ValueError(f"PDF has {page_count} pages; at most {max_pages} are supported.")
+        for i in range(page_count):
+            if time.monotonic() > deadline:
+                raise _timeout_error(timeout)
+            yield i + 1, page_count, pages[i].extract_text() or ""
+    except PyPdfError as e:
+        raise ValueError(f"Not a readable PDF ({e}).") from None
+
+
+@metrics.timed("pdf_extract")
+def extract_text(data, on_page=None, timeout=TIMEOUT, **limits):
+    """Full text of the PDF ``data``.
+
+    ``on_page(done, total)`` is called after each page.
+    """
+    parts = []
+    with _hard_deadline(timeout):
+        for done, total, text in iter_page_texts(data, timeout=timeout, **limits):
+            parts.append(text)
+            if on_page is not None:
+                on_page(done, total)
+    return "".join(parts)
+
+
+def cached_text(key):
+    """Text remembered for the upload with content hash ``key``, or None."""
+    with _texts_lock:
+        return _texts.get(key)
+
+
+def remember_text(key, text):
+    with _texts_lock:
+        _texts[key] = text
@@ -0,0 +1,290 @@
+# Exportable placement reports (PDF or XLSX).
+#
+# A report holds the Admin dashboard's aggregates for a college -- or for one
+# Branch/Year slice of it -- plus per-company tables, so results can be
+# shared without screenshots:
+#
+#     python -m hirelytics.report placement_data.csv -o report.pdf --branch CSE --year 2024
+#
+# Everything in a report is aggregated per company, branch or year: its size
+# grows with the number of companies and years, not with the number of
+# students, and the student rows are only read by the groupbys.  XLSX rows
+# are streamed to the output through openpyxl's write-only mode.  PDF tables
+# are generated TABLE_ROWS rows at a time as separate flowables, so layout
+# never has to split one huge table (reportlab itself keeps the pages until
+# the document is saved).  report_for caches the finished file per dataset
+# SHA and slice, so a report is rebuilt only when the data changes.
+import argparse
+import io
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from hirelytics import metrics
+from hirelytics.aggregates import ALL
+
+FORMATS = {
+    "pdf": "application/pdf",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+COMPANY_COLS = ['Company', 'Hires', 'AvgPackage', 'MedianPackage', 'MaxPackage', 'Branches']
+TABLE_ROWS = 40
+MAX_PDF_YEARS = 8   # Company x Year columns that fit an A4 page (XLSX has all)
+
+
+@dataclass(frozen=True)
+class ReportData:
+    title: str
+    scope: str                     # "Branch: ... | Year: ..."
+    summary: list                  # (label, value) pairs
+    insights: object               # aggregates.SliceAggregates of the slice
+    companies: pd.DataFrame        # COMPANY_COLS, most hires first
+    company_years: pd.DataFrame    # Company plus one hires column per year (all-years reports only)
+
+
+def _money(value):
+    return "-" if value is None or value != value else f"{value:,.2f}"
+
+
+def report_data(df, aggregates, branch=ALL, year=ALL, college=""):
+    """Collect a slice's report contents; raises ValueError for an empty slice."""
+    insights = aggregates.get(branch, year)
+    if insights is None:
+        raise ValueError(f"No placement records for Branch {branch}, Year {year}.")
+    part = df.iloc[insights.rows]
+    placed = part[part['Package'].to_numpy(dtype=float) > 0]
+    package = placed['Package'].to_numpy(dtype=float)
+
+    by_company = placed.groupby('Company', observed=True)
+    companies = by_company['Package'].agg(
+        Hires='size', AvgPackage='mean', MedianPackage='median', MaxPackage='max'
+    )
+    companies['Branches'] = by_company['Branch'].nunique()
+    companies = companies[companies['Hires'] > 0].astype(
+        {'AvgPackage': float, 'MedianPackage': float, 'MaxPackage': float}
+    ).round(2)
+    companies = companies.sort_values(['Hires', 'AvgPackage'], ascending=False)
+    companies = companies.rename_axis('Company').reset_index().astype({'Company': object})[COMPANY_COLS]
+
+    company_years = pd.DataFrame()
+    if str(year) == ALL and len(companies):
+        counts = placed.groupby(['Company', 'Year'], observed=True).size().unstack(fill_value=0)
+        counts.columns = [str(col) for col in counts.columns]
+        company_years = counts.reindex(companies['Company']).fillna(0).astype(int)
+        company_years = company_years.rename_axis('Company').reset_index()
+
+    summary = [
+        ("Students", f"{len(part):,}"),
+        ("Placed", f"{len(placed):,}"),
+        ("Placement rate", f"{len(placed) / len(part):.1%}" if len(part) else "-"),
+        ("Hiring companies", f"{len(companies):,}"),
+        ("Average package", _money(package.mean() if len(package) else None)),
+        ("Median package", _money(float(np.median(package)) if len(package) else None)),
+        ("Highest package", _money(package.max() if len(package) else None)),
+    ]
+    return ReportData(
+        title=f"Placement Report: {college}" if college else "Placement Report",
+        scope=f"Branch: {branch} | Year: {year}",
+        summary=summary,
+        insights=insights,
+        companies=companies,
+        company_years=company_years,
+    )
+
+
+def _sections(data):
+    """``(title, DataFrame)`` tables of a report, in order."""
+    insights = data.insights
+    return [
+        ("Top Hiring Companies", insights.top_companies.rename_axis('Company').reset_index(name='Count')),
+        ("Branch-wise Avg Package", insights.branch_avg_package.round(2).rename_axis('Branch').reset_index(name='AvgPackage')),
+        ("Year-wise Placement Count", insights.year_counts),
+        ("Internship Impact on Package", insights.internship_box.round(2)),
+        ("Companies", data.companies),
+        ("Company Hires by Year", data.company_years),
+    ]
+
+
+# -- PDF -------------------------------------------------------------------
+
+def _bar_chart(series, title, horizontal=False):
+    from reportlab.graphics.charts.barcharts import HorizontalBarChart, VerticalBarChart
+    from reportlab.graphics.shapes import Drawing, String
+    from reportlab.lib import colors
+
+    drawing = Drawing(480, 200)
+    chart = HorizontalBarChart() if horizontal else VerticalBarChart()
+    chart.x, chart.y, chart.width, chart.height = (130, 20, 330, 150) if horizontal else (50, 30, 410, 140)
+    chart.data = [[float(v) for v in series.to_numpy()]]
+    chart.categoryAxis.categoryNames = [str(label) for label in series.index]
+    chart.categoryAxis.labels.fontSize = 7
+    chart.valueAxis.valueMin = 0
+    chart.bars[0].fillColor = colors.HexColor("#FF4B4B")
+    drawing.add(chart)
+    drawing.add(String(0, 185, title, fontName="Helvetica-Bold", fontSize=11))
+    return drawing
+
+
+def _pdf_tables(frame, style, max_rows=TABLE_ROWS):
+    """One reportlab Table per ``max_rows`` rows, each repeating the header."""
+    from reportlab.platypus import Table
+
+    header = [str(col) for col in frame.columns]
+    for start in range(0, len(frame), max_rows):
+        rows = frame.iloc[start:start + max_rows].itertuples(index=False, name=None)
+        body = [["" if pd.isna(v) else f"{v:,.2f}" if isinstance(v, float) else str(v) for v in row] for row in rows]
+        yield Table([header, *body], style=style, hAlign="LEFT", repeatRows=1)
+
+
+def _pdf_story(data):
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import PageBreak, Paragraph, Spacer, Table, TableStyle
+
+    sheet = getSampleStyleSheet()
+    style = TableStyle([
+        ("FONT", (0, 0), (-1, -1), "Helvetica", 8),
+        ("FONT", (0, 0), (-1, 0), "Helvetica-Bold", 8),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#26263A")),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#F2F2F2")]),
+        ("ALIGN", (1, 1), (-1, -1), "RIGHT"),
+    ])
+    summary_style = TableStyle([
+        ("FONT", (0, 0), (-1, -1), "Helvetica", 10),
+        ("FONT", (0, 0), (0, -1), "Helvetica-Bold", 10),
+        ("ALIGN", (1, 0), (1, -1), "RIGHT"),
+    ])
+    insights = data.insights
+    tables = dict(_sections(data))
+
+    # Page 1: headline numbers and the dashboard charts
+    yield Paragraph(data.title, sheet["Title"])
+    yield Paragraph(data.scope, sheet["Normal"])
+    yield Spacer(1, 12)
+    yield Table([list(item) for item in data.summary], style=summary_style, hAlign="LEFT", colWidths=[140, 100])
+    yield Spacer(1, 18)
+    if len(insights.top_companies):
+        yield _bar_chart(insights.top_companies, "Top Hiring Companies", horizontal=True)
+    if len(insights.branch_avg_package):
+        yield _bar_chart(insights.branch_avg_package, "Branch-wise Avg Package")
+    if len(insights.year_counts):
+        yield _bar_chart(insights.year_counts.set_index('Year')['Count'], "Year-wise Placement Count")
+    if len(insights.internship_box):
+        yield Paragraph("Internship Impact on Package", sheet["Heading2"])
+        yield from _pdf_tables(tables["Internship Impact on Package"], style)
+
+    # Then the per-company tables
+    if not data.companies.empty:
+        yield PageBreak()
+        yield Paragraph("Companies", sheet["Heading2"])
+        yield from _pdf_tables(data.companies, style)
+    by_year = data.company_years
+    if not by_year.empty:
+        title = "Company Hires by Year"
+        if by_year.shape[1] > MAX_PDF_YEARS + 1:
+            by_year = by_year.iloc[:, [0, *range(by_year.shape[1] - MAX_PDF_YEARS, by_year.shape[1])]]
+            title = f"{title} (latest {MAX_PDF_YEARS} years)"
+        yield PageBreak()
+        yield Paragraph(title, sheet["Heading2"])
+        yield from _pdf_tables(by_year, style)
+
+
+def write_pdf(data, out):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.platypus import SimpleDocTemplate
+
+    doc = SimpleDocTemplate(out, pagesize=A4, title=data.title, leftMargin=40, rightMargin=40, topMargin=40, bottomMargin=40)
+    doc.build(list(_pdf_story(data)))
+
+
+# -- XLSX ------------------------------------------------------------------
+
+def _xlsx_value(value):
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def write_xlsx(data, out):
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    workbook = Workbook(write_only=True)
+    bold = Font(bold=True)
+
+    def header(sheet, values):
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(sheet, value=str(value))
+            cell.font = bold
+            cells.append(cell)
+        return cells
+
+    summary = workbook.create_sheet("Summary")
+    summary.append(header(summary, [data.title]))
+    summary.append([data.scope])
+    summary.append([])
+    for label, value in data.summary:
+        summary.append([label, value])
+
+    for title, frame in _sections(data):
+        if frame.empty:
+            continue
+        sheet = workbook.create_sheet(title[:31])
+        sheet.append(header(sheet, frame.columns))
+        for row in frame.itertuples(index=False, name=None):
+            sheet.append([_xlsx_value(v) for v in row])
+    workbook.save(out)
+
+
+@metrics.timed("report")
+def write_report(data, out, fmt="pdf"):
+    """Write ``data`` to ``out`` (a path or binary file object) as ``fmt``."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown report format: {fmt}")
+    (write_pdf if fmt == "pdf" else write_xlsx)(data, out)
+
+
+def render_report(df, aggregates, branch=ALL, year=ALL, fmt="pdf", college=""):
+    """The report file for a slice, as bytes."""
+    buffer = io.BytesIO()
+    write_report(report_data(df, aggregates, branch, year, college), buffer, fmt)
+    return buffer.getvalue()
+
+
+def report_for(cache, dataset_sha, df, aggregates, branch=ALL, year=ALL, fmt="pdf", college=""):
+    """A slice's report bytes, built once per dataset SHA in the shared content cache."""
+    key = ("report", fmt, branch, str(year), college)
+    return cache.derived(dataset_sha, key, lambda: render_report(df, aggregates, branch, year, fmt, college))
+
+
+def main(argv=None):
+    from hirelytics.aggregates import build_aggregates
+    from hirelytics.dataset import read_placement_path
+    from hirelytics.schema import compact_dtypes
+
+    parser = argparse.ArgumentParser(description="Build a PDF or XLSX placement report.")
+    parser.add_argument("data", help="placement data file (.csv, .xlsx or .arrow)")
+    parser.add_argument("-o", "--output", required=True, help="output .pdf or .xlsx")
+    parser.add_argument("--branch", default=ALL, help="only this branch (default: all)")
+    parser.add_argument("--year", default=ALL, help="only this year (default: all)")
+    parser.add_argument("--college", default="", help="college name for the title")
+    args = parser.parse_args(argv)
+
+    fmt = os.path.splitext(args.output)[1].lower().lstrip(".")
+    if fmt not in FORMATS:
+        parser.error(f"output must end in {' or '.join('.' + f for f in FORMATS)}")
+    df = compact_dtypes(read_placement_path(args.data))
+    try:
+        data = report_data(df, build_aggregates(df), args.branch, args.year, args.college)
+    except ValueError as e:
+        parser.error(str(e))
+    write_report(data, args.output, fmt)
+
+
+if __name__ == "__main__":
+    main()
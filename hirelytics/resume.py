@@ -0,0 +1,39 @@
+# Resume analysis against a college's placed-student profile.
+#
+# Shared by the Student page's Resume Analyzer and the batch screening tools,
+# so one resume gets the same result wherever it is analyzed.
+from dataclasses import dataclass
+
+from hirelytics import metrics
+from hirelytics.skills import match_resume_skills
+
+
+@dataclass(frozen=True)
+class PlacementProfile:
+    top_skills: tuple
+    internship_important: bool
+
+
+@dataclass(frozen=True)
+class ResumeAnalysis:
+    matched_skills: list
+    missing_skills: list
+    has_internship: bool
+    suggest_internship: bool
+
+
+def placement_profile(df, skill_index, n=10):
+    """Top skills and internship importance among placed students."""
+    placed_mask = (df["Package"] > 0).to_numpy()
+    top_skills = skill_index.top_skills(n, rows=placed_mask)
+    internship_counts = df.loc[placed_mask, "Internship"].value_counts()
+    internship_important = bool(internship_counts.get("Yes", 0) > internship_counts.get("No", 0))
+    return PlacementProfile(tuple(top_skills), internship_important)
+
+
+@metrics.timed("resume_match")
+def analyze_resume(resume_text, profile):
+    resume_text = resume_text.lower()
+    matched, missing = match_resume_skills(resume_text, profile.top_skills)
+    has_internship = "intern" in resume_text
+    return ResumeAnalysis(matched, missing, has_internship, profile.internship_important and not has_internship)
@@ -0,0 +1,232 @@
+# Resume PDF rendering.
+#
+# Resumes are laid out with reportlab's Platypus flowables: text is measured
+# and wrapped by the layout engine and long sections continue on further
+# pages instead of overlapping.  Paragraph styles are built once per
+# process, processed profile photos are cached by content hash, and
+# render_batch renders many resumes from a CSV on a process pool.
+#
+#     python -m hirelytics.resume_render students.csv -o resumes.zip
+import argparse
+import csv
+import hashlib
+import io
+import os
+import re
+import sys
+import threading
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, fields
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+from cachetools import LRUCache
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import BaseDocTemplate, Frame, FrameBreak, NextPageTemplate, PageTemplate, Paragraph, Spacer
+
+from hirelytics import metrics
+from hirelytics.jobs import mp_context
+
+WIDTH, HEIGHT = A4
+HEADER_HEIGHT = 80
+PHOTO_SIZE = 90
+MARGIN = 40
+SIDEBAR_WIDTH = 140
+GUTTER = 20
+
+_photo_cache = LRUCache(maxsize=256)
+_photo_lock = threading.Lock()
+
+
+@dataclass
+class ResumeData:
+    name: str = ""
+    title: str = ""
+    about: str = ""
+    email: str = ""
+    phone: str = ""
+    address: str = ""
+    website: str = ""
+    education: str = ""
+    skills: str = ""
+    experience: str = ""
+    photo: bytes = None
+
+
+@lru_cache(maxsize=None)
+def styles():
+    return {
+        "heading": ParagraphStyle("heading", fontName="Helvetica-Bold", fontSize=14, leading=18, spaceBefore=12, spaceAfter=4),
+        "body": ParagraphStyle("body", fontName="Helvetica", fontSize=11, leading=15),
+    }
+
+
+def profile_photo(data):
+    """Circle-masked PNG of an uploaded photo, cached by SHA-256 of the upload."""
+    from PIL import Image, ImageDraw
+
+    key = hashlib.sha256(data).hexdigest()
+    with _photo_lock:
+        png = _photo_cache.get(key)
+    if png is None:
+        img = Image.open(io.BytesIO(data)).convert("RGB").resize((PHOTO_SIZE, PHOTO_SIZE))
+        mask = Image.new("L", img.size, 0)
+        ImageDraw.Draw(mask).ellipse((0, 0, img.size[0], img.size[1]), fill=255)
+        img.putalpha(mask)
+        out = io.BytesIO()
+        img.save(out, format="PNG")
+        png = out.getvalue()
+        with _photo_lock:
+            _photo_cache[key] = png
+    return png
+
+
+def _paragraphs(text, style):
+    return [Paragraph(escape(line) or "&nbsp;", style) for line in text.split("\n")]
+
+
+def _section(title, text):
+    return [Paragraph(escape(title), styles()["heading"]), *_paragraphs(text, styles()["body"])]
+
+
+def _draw_header(resume):
+    def draw(c, doc):
+        c.saveState()
+        c.setFillColorRGB(0.15, 0.15, 0.2)
+        c.rect(0, HEIGHT - HEADER_HEIGHT, WIDTH, HEADER_HEIGHT, fill=1, stroke=0)
+        c.setFillColor(colors.white)
+        c.setFont("Helvetica-Bold", 24)
+        c.drawString(150, HEIGHT - 50, resume.name)
+        c.setFont("Helvetica", 14)
+        c.drawString(150, HEIGHT - 65, resume.title)
+        if resume.photo:
+            photo = ImageReader(io.BytesIO(profile_photo(resume.photo)))
+            c.drawImage(photo, MARGIN, HEIGHT - 110, PHOTO_SIZE, PHOTO_SIZE, mask='auto')
+        c.restoreState()
+    return draw
+
+
+def _frames():
+    # Built per document: doc.build tracks layout state on the Frame objects,
+    # so sharing them would make concurrent renders interfere.
+    top = HEIGHT - 125
+    sidebar = Frame(MARGIN, MARGIN, SIDEBAR_WIDTH, top - MARGIN, id="sidebar", leftPadding=0, rightPadding=0)
+    main_x = MARGIN + SIDEBAR_WIDTH + GUTTER
+    main = Frame(main_x, MARGIN, WIDTH - MARGIN - main_x, top - MARGIN, id="main", leftPadding=0, rightPadding=0)
+    full = Frame(MARGIN, MARGIN, WIDTH - 2 * MARGIN, HEIGHT - 2 * MARGIN, id="full", leftPadding=0, rightPadding=0)
+    return sidebar, main, full
+
+
+def _fits(flowables, frame):
+    """True if ``flowables`` fit in ``frame`` without continuing elsewhere."""
+    width, height = frame._getAvailableWidth(), frame._aH
+    used = 0
+    for flowable in flowables:
+        used += flowable.getSpaceBefore() + flowable.wrap(width, height)[1] + flowable.getSpaceAfter()
+    return used <= height
+
+
+@metrics.timed("resume_render")
+def render_resume(resume, out=None):
+    """Render ``resume`` to ``out`` (a binary file object) or return the PDF bytes.
+
+    Skills are listed in the sidebar; when they do not fit there they move
+    into the main column as one wrapped section, because the sidebar has no
+    continuation on later pages.
+    """
+    sidebar, main, full = _frames()
+    buffer = out if out is not None else io.BytesIO()
+    doc = BaseDocTemplate(buffer, pagesize=A4, title=resume.name or "Resume")
+    doc.addPageTemplates([
+        PageTemplate(id="first", frames=[sidebar, main], onPage=_draw_header(resume)),
+        PageTemplate(id="later", frames=[full]),
+    ])
+    body = styles()["body"]
+    contact = [escape(v) for v in (resume.phone, resume.email, resume.address, resume.website) if v]
+    skills = [s.strip() for s in resume.skills.split(",") if s.strip()]
+    side = [
+        Paragraph("Contact", styles()["heading"]),
+        *[Paragraph(line, body) for line in contact],
+    ]
+    skills_side = [Paragraph("Skills", styles()["heading"]), *[Paragraph(escape(skill), body) for skill in skills]]
+    if _fits(side + skills_side, sidebar):
+        side += skills_side
+        skills_main = []
+    else:
+        skills_main = [*_section("Skills", " · ".join(skills)), Spacer(1, 6)]
+    story = [
+        NextPageTemplate("later"),
+        *side,
+        FrameBreak(),
+        *_section("About Me", resume.about),
+        Spacer(1, 6),
+        *skills_main,
+        *_section("Education", resume.education),
+        Spacer(1, 6),
+        *_section("Experience", resume.experience),
+    ]
+    doc.build(story)
+    if out is None:
+        return buffer.getvalue()
+    return None
+
+
+def _render_row(index, row, photo_dir):
+    row = {k: (v or "") for k, v in row.items()}
+    photo = None
+    if row.get("photo"):
+        with open(os.path.join(photo_dir, row["photo"]), "rb") as f:
+            photo = f.read()
+    names = {f.name for f in fields(ResumeData)} - {"photo"}
+    resume = ResumeData(**{k: v for k, v in row.items() if k in names}, photo=photo)
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", resume.name).strip("_") or "resume"
+    return f"{index:04d}_{slug}.pdf", render_resume(resume)
+
+
+def render_batch(rows, out, photo_dir=".", max_workers=None, window=None):
+    """Render resume rows (dicts with ResumeData field names) into a ZIP file.
+
+    ``photo`` columns are paths relative to ``photo_dir``.  Yields each
+    finished file name so callers can report progress.  At most ``window``
+    resumes are in flight at once, and each finished PDF is written to the
+    archive right away, so memory does not grow with the size of the batch.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    window = window or max_workers * 4
+    rows = enumerate(rows, 1)
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context()) as pool, zipfile.ZipFile(out, "w") as archive:
+        pending = set()
+        while True:
+            for i, row in rows:
+                pending.add(pool.submit(_render_row, i, row, photo_dir))
+                if len(pending) >= window:
+                    break
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, pdf = future.result()
+                archive.writestr(name, pdf)
+                yield name
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render resumes from a CSV into a ZIP of PDFs.")
+    parser.add_argument("csv", help="CSV with columns: " + ", ".join(f.name for f in fields(ResumeData)))
+    parser.add_argument("-o", "--output", default="resumes.zip", help="output ZIP file")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes")
+    args = parser.parse_args(argv)
+
+    with open(args.csv, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    photo_dir = os.path.dirname(os.path.abspath(args.csv))
+    for done, name in enumerate(render_batch(rows, args.output, photo_dir, args.workers), 1):
+        print(f"[{done}/{len(rows)}] {name}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
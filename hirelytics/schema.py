@@ -0,0 +1,48 @@
+# Placement data schema shared by the pages and the data pipeline.
+import pandas as pd
+
+# --- Required template columns ---
+REQUIRED_COLS = ['CGPA', 'Package', 'Company', 'Branch', 'Internship', 'Year', 'Skills']
+
+NUMERIC_COLS = ['CGPA', 'Package']
+TEXT_COLS = ['Company', 'Branch', 'Internship', 'Skills']
+
+# Low-cardinality text columns stored as categoricals in shared frames
+CATEGORY_COLS = ['Company', 'Branch', 'Internship']
+
+
+def normalize_frame(df):
+    """Project to REQUIRED_COLS (when present) and coerce column dtypes."""
+    df = df.copy()
+    df.columns = df.columns.astype(str).str.strip()
+    if all(col in df.columns for col in REQUIRED_COLS):
+        df = df[REQUIRED_COLS]
+    for col in NUMERIC_COLS:
+        if col in df.columns:
+            values = df[col]
+            if values.dtype == "float32":
+                # From a compact frame: recover the decimal the user entered
+                # rather than the float32 binary expansion (7.3 -> 7.300000190734863).
+                values = values.astype(str)
+            df[col] = pd.to_numeric(values, errors="coerce").astype("float64")
+    if 'Year' in df.columns:
+        df['Year'] = pd.to_numeric(df['Year'], errors="coerce").round().astype("Int64")
+    for col in TEXT_COLS:
+        if col in df.columns:
+            # Plain object columns with None for missing values, the same
+            # thing pandas gets back from an Arrow string column.
+            values = df[col].astype("string").str.strip()
+            df[col] = values.astype(object).where(values.notna(), None)
+    return df.reset_index(drop=True)
+
+
+def compact_dtypes(df):
+    """Memory-compact copy of a normalized frame, for sharing between sessions.
+
+    CATEGORY_COLS become categoricals and NUMERIC_COLS float32; columns that
+    already have the compact dtype are reused without copying.  Pass the
+    result through normalize_frame before writing it back to storage.
+    """
+    dtypes = {col: "category" for col in CATEGORY_COLS if col in df.columns}
+    dtypes.update({col: "float32" for col in NUMERIC_COLS if col in df.columns})
+    return df.astype(dtypes, copy=False)
@@ -0,0 +1,125 @@
+# Skill vocabulary index over a placement dataset.
+#
+# Each dataset's free-text Skills column is tokenized once into a vocabulary
+# (normalized skill -> column id) and a sparse student x skill CSR matrix.
+# Matching a student's skills against every row is then a single sparse
+# matrix-vector product, and skill popularity is a column sum.
+import re
+
+import numpy as np
+
+from hirelytics import metrics
+
+_SEPARATORS = re.compile(r"[,;|\n]+")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_skill(skill):
+    return _SPACES.sub(" ", skill.strip().lower())
+
+
+def split_skills(text):
+    """Split a free-text skills cell on commas (and ; | newlines)."""
+    if not isinstance(text, str):
+        return []
+    return [s for s in (normalize_skill(part) for part in _SEPARATORS.split(text)) if s]
+
+
+class SkillIndex:
+    def __init__(self, vocabulary, matrix):
+        self.vocabulary = vocabulary          # skill -> column id
+        self.skills = list(vocabulary)        # column id -> skill
+        self.matrix = matrix                  # CSR, rows x len(vocabulary), 0/1
+
+    @classmethod
+    @metrics.timed("skill_index")
+    def from_series(cls, series):
+        from scipy import sparse
+
+        vocabulary = {}
+        indptr = [0]
+        indices = []
+        for text in series:
+            ids = {vocabulary.setdefault(skill, len(vocabulary)) for skill in split_skills(text)}
+            indices.extend(sorted(ids))
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=np.int32)
+        matrix = sparse.csr_matrix(
+            (data, np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(indptr) - 1, len(vocabulary)),
+        )
+        return cls(vocabulary, matrix)
+
+    @classmethod
+    def from_frame(cls, df):
+        return cls.from_series(df['Skills'])
+
+    def skill_vector(self, user_skills):
+        vector = np.zeros(len(self.vocabulary), dtype=np.int32)
+        for skill in user_skills:
+            col = self.vocabulary.get(normalize_skill(skill))
+            if col is not None:
+                vector[col] = 1
+        return vector
+
+    def match_counts(self, user_skills):
+        """Number of ``user_skills`` listed in each row, as an int array."""
+        return self.matrix @ self.skill_vector(user_skills)
+
+    def skill_counts(self, rows=None):
+        """Number of rows listing each skill, optionally restricted to a boolean mask."""
+        matrix = self.matrix if rows is None else self.matrix[np.asarray(rows, dtype=bool)]
+        return np.asarray(matrix.sum(axis=0)).ravel()
+
+    def top_skills(self, n=10, rows=None):
+        """Most common skills as a ``{skill: count}`` dict, most frequent first."""
+        counts = self.skill_counts(rows)
+        order = np.argsort(-counts, kind="stable")[:n]
+        return {self.skills[i]: int(counts[i]) for i in order if counts[i] > 0}
+
+
+def skill_index_for(cache, dataset_sha, df):
+    """The dataset's SkillIndex, built once per SHA in the shared content cache."""
+    return cache.derived(dataset_sha, "skill_index", lambda: SkillIndex.from_frame(df))
+
+
+_WORDS = re.compile(r"[a-z0-9][a-z0-9+#.\-]*[a-z0-9+#]|[a-z0-9]")
+
+
+def resume_ngrams(text, max_n):
+    """Unique 1..max_n word n-grams of ``text``, grouped by n."""
+    words = _WORDS.findall(text.lower())
+    return {
+        n: {" ".join(words[i:i + n]) for i in range(len(words) - n + 1)}
+        for n in range(1, max_n + 1)
+    }
+
+
+def match_resume_skills(resume_text, skills, score_cutoff=85):
+    """Split ``skills`` into ``(matched, missing)`` lists for a resume.
+
+    Skills are first looked up exactly among the resume's n-grams (so
+    multi-word skills such as "machine learning" work); only the rest go
+    through one batched ``rapidfuzz`` comparison per n-gram length, and a
+    skill matches if any n-gram scores above ``score_cutoff``.  Both lists
+    keep the order of ``skills`` and contain no duplicates.
+    """
+    from rapidfuzz import fuzz, process
+
+    skills = list(dict.fromkeys(normalize_skill(s) for s in skills if normalize_skill(s)))
+    if not skills:
+        return [], []
+    lengths = {skill: len(skill.split(" ")) for skill in skills}
+    ngrams = resume_ngrams(resume_text, max(lengths.values()))
+
+    matched = {skill for skill in skills if skill in ngrams[lengths[skill]]}
+    remaining = [skill for skill in skills if skill not in matched]
+    for n in sorted({lengths[skill] for skill in remaining}):
+        queries = [skill for skill in remaining if lengths[skill] == n]
+        choices = list(ngrams[n])
+        if not choices:
+            continue
+        scores = process.cdist(queries, choices, scorer=fuzz.ratio, score_cutoff=score_cutoff, workers=-1)
+        matched.update(q for q, row in zip(queries, scores) if (row > score_cutoff).any())
+
+    return [s for s in skills if s in matched], [s for s in skills if s not in matched]
@@ -0,0 +1,146 @@
+# Typed columnar snapshots of placement data (Arrow IPC files).
+#
+# Parsing CSV/XLSX on every rerun is the slowest part of loading a college's
+# data.  When the admin uploads a file we also write a normalized Arrow IPC
+# snapshot next to it; readers memory-map the snapshot and share the result
+# read-only across every session of the process.
+import io
+import os
+import tempfile
+
+import pandas as pd
+import pyarrow as pa
+
+from hirelytics import metrics
+from hirelytics.schema import CATEGORY_COLS, NUMERIC_COLS, compact_dtypes, normalize_frame
+
+SOURCE_SHA_KEY = b"hirelytics.source_sha"
+
+SNAPSHOT_DIR = os.path.join(tempfile.gettempdir(), "hirelytics-snapshots")
+
+
+def snapshot_path(college_code):
+    return f"placement_data_{college_code}.arrow"
+
+
+# Column types of a snapshot with the full REQUIRED_COLS schema.
+SNAPSHOT_SCHEMA = pa.schema([
+    ("CGPA", pa.float64()),
+    ("Package", pa.float64()),
+    ("Company", pa.string()),
+    ("Branch", pa.string()),
+    ("Internship", pa.string()),
+    ("Year", pa.int64()),
+    ("Skills", pa.string()),
+])
+
+
+def _with_source(schema, source_sha):
+    if source_sha is None:
+        return schema
+    metadata = dict(schema.metadata or {})
+    metadata[SOURCE_SHA_KEY] = source_sha.encode()
+    return schema.with_metadata(metadata)
+
+
+def write_ipc(sink, frames, source_sha=None, schema=SNAPSHOT_SCHEMA):
+    """Write normalized frames to ``sink`` as one uncompressed Arrow IPC file.
+
+    Frames are converted and written one at a time, so the whole dataset
+    never has to be in memory.  Uncompressed buffers let readers memory-map
+    the file without copying.
+    """
+    schema = _with_source(schema, source_sha)
+    with pa.ipc.new_file(sink, schema) as writer:
+        for df in frames:
+            writer.write_table(pa.Table.from_pandas(normalize_frame(df), schema=schema, preserve_index=False))
+
+
+def frame_to_ipc(df, source_sha=None):
+    """Serialize a frame to Arrow IPC file bytes."""
+    df = normalize_frame(df)
+    schema = None if list(df.columns) != list(SNAPSHOT_SCHEMA.names) else SNAPSHOT_SCHEMA
+    if schema is None:
+        schema = pa.Schema.from_pandas(df, preserve_index=False)
+    sink = io.BytesIO()
+    write_ipc(sink, [df], source_sha, schema)
+    return sink.getvalue()
+
+
+def source_sha_of(table):
+    value = (table.schema.metadata or {}).get(SOURCE_SHA_KEY)
+    return value.decode() if value is not None else None
+
+
+def _remove_spilled(path):
+    # Readers that still map the file keep its pages until they unmap it.
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _local_file(storage, stored):
+    # Memory-mapping needs a real file: use the backend's own file when it
+    # has one, otherwise spill the blob to the snapshot directory once.  The
+    # spilled file is per process and removed when its SHA leaves the cache.
+    path = storage.local_path(stored.path)
+    if path is not None:
+        return path
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    path = os.path.join(SNAPSHOT_DIR, f"{stored.sha}.{os.getpid()}.arrow")
+    if not os.path.exists(path):
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(stored.data)
+        os.replace(tmp, path)
+        storage.cache.on_discard(stored.sha, lambda: _remove_spilled(path))
+    return path
+
+
+def _compact_table(table):
+    # Dictionary-encode and downcast in Arrow, so the text columns never
+    # exist as per-row Python strings on the way to pandas categoricals.
+    for i, field in enumerate(table.schema):
+        if field.name in CATEGORY_COLS and pa.types.is_string(field.type):
+            table = table.set_column(i, field.name, table.column(i).dictionary_encode())
+        elif field.name in NUMERIC_COLS and pa.types.is_float64(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.float32()))
+    return table
+
+
+def read_snapshot(storage, stored):
+    """Memory-map a stored snapshot and return ``(table, frame)``.
+
+    The frame is dtype-compacted (see schema.compact_dtypes) and shared, so
+    it must be treated as immutable.
+    """
+    with metrics.span("snapshot.read"):
+        source = pa.memory_map(_local_file(storage, stored), "r")
+        table = pa.ipc.open_file(source).read_all()
+        df = _compact_table(table).to_pandas(split_blocks=True, types_mapper={pa.int64(): pd.Int64Dtype()}.get)
+        df = compact_dtypes(df)
+    metrics.incr("rows_parsed", len(df))
+    return table, df
+
+
+def write_snapshot(storage, college_code, df, source_sha=None):
+    return storage.put(snapshot_path(college_code), frame_to_ipc(df, source_sha), "Update placement snapshot")
+
+
+def write_snapshot_chunks(storage, college_code, frames, source_sha=None):
+    """Like write_snapshot, but streams ``frames`` through a spooled temp file."""
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as sink:
+        write_ipc(sink, frames, source_sha)
+        return storage.put_file(snapshot_path(college_code), sink, "Update placement snapshot")
+
+
+def load_snapshot(storage, college_code, source_sha):
+    """Return the shared snapshot frame if it is current for ``source_sha``."""
+    stored = storage.get(snapshot_path(college_code))
+    if stored is None:
+        return None
+    table, df = storage.cache.derived(stored.sha, "snapshot", lambda: read_snapshot(storage, stored))
+    if source_sha is not None and source_sha_of(table) != source_sha:
+        return None
+    return df
@@ -0,0 +1,91 @@
+# Import cost of each page section, for tuning cold starts.
+#
+# The pages import the heavy dependencies of a section (sklearn, reportlab,
+# PyPDF2, altair, ...) only when that section is first shown.  This module
+# lists those imports per section and measures what each one costs a fresh
+# process on top of the modules every page needs:
+#
+#     python -m hirelytics.startup            # table
+#     python -m hirelytics.startup --json
+#
+# Each section is measured in its own interpreter so shared dependencies are
+# not hidden by an earlier section having imported them.
+import argparse
+import json
+import subprocess
+import sys
+
+# Imported by every rerun of either page.
+BASE = [
+    "streamlit", "streamlit_option_menu", "pandas",
+    "hirelytics.dataset", "hirelytics.jobs", "hirelytics.metrics", "hirelytics.model",
+    "hirelytics.storage", "hirelytics.warmup",
+]
+
+# Imported on first use of a section.
+SECTIONS = {
+    "student.prediction": ["sklearn.linear_model", "hirelytics.charts", "hirelytics.neighbors", "scipy.sparse"],
+    "student.resume_analyzer": ["hirelytics.pdf_text", "PyPDF2", "rapidfuzz.process", "hirelytics.resume", "scipy.sparse"],
+    "student.resume_builder": ["hirelytics.resume_render", "PIL.Image"],
+    "student.college_insights": ["hirelytics.aggregates", "hirelytics.charts"],
+    "admin.upload": ["hirelytics.ingest", "openpyxl"],
+    "admin.charts": ["altair", "hirelytics.aggregates", "hirelytics.charts"],
+    "admin.report": ["hirelytics.report", "reportlab.platypus", "reportlab.graphics.charts.barcharts", "openpyxl"],
+    "admin.batch_screening": ["hirelytics.batch", "hirelytics.resume", "scipy.sparse"],
+    "admin.cohort_scoring": ["hirelytics.cohort", "sklearn.linear_model", "scipy.sparse", "pyarrow.parquet"],
+    "admin.benchmarks": ["hirelytics.analytics"],
+}
+
+_PROBE = """
+import importlib, json, sys, time
+base, modules = json.loads(sys.argv[1])
+start = time.perf_counter()
+for name in base:
+    importlib.import_module(name)
+base_s = time.perf_counter() - start
+start = time.perf_counter()
+for name in modules:
+    importlib.import_module(name)
+print(json.dumps({"base_s": base_s, "section_s": time.perf_counter() - start}))
+"""
+
+
+def measure(section, python=sys.executable):
+    """``{"base_s", "section_s"}`` for ``section`` (or "base") in a fresh interpreter."""
+    modules = [] if section == "base" else SECTIONS[section]
+    output = subprocess.run(
+        [python, "-c", _PROBE, json.dumps([BASE, modules])],
+        capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output)
+
+
+def report(sections=None, repeat=3):
+    """Best-of-``repeat`` import seconds for the base modules and each section."""
+    sections = list(SECTIONS) if sections is None else sections
+    results = {"base": min(measure("base")["base_s"] for _ in range(repeat))}
+    for section in sections:
+        results[section] = min(measure(section)["section_s"] for _ in range(repeat))
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the import cost of each page section.")
+    parser.add_argument("sections", nargs="*", help=f"sections to measure (default: all of {', '.join(SECTIONS)})")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print JSON instead of a table")
+    args = parser.parse_args(argv)
+    unknown = set(args.sections) - set(SECTIONS)
+    if unknown:
+        parser.error(f"unknown sections: {', '.join(sorted(unknown))}")
+    results = report(args.sections or None, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    width = max(len(name) for name in results)
+    for name, seconds in results.items():
+        print(f"{name:<{width}}  {seconds * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
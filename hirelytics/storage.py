@@ -0,0 +1,550 @@
+# Placement-data storage backends with a process-wide content cache.
+#
+# Streamlit re-executes each page script on every widget interaction, so the
+# pages must not talk to GitHub directly on every rerun.  Backends hand out
+# file contents through a ContentCache keyed by the git blob SHA: a file whose
+# SHA has not changed is never downloaded (or parsed) a second time, and the
+# SHA itself is only re-validated once per TTL.
+import base64
+import hashlib
+import logging
+import os
+import shutil
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+
+from hirelytics import metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 60.0
+DEFAULT_MEMORY_BUDGET = 2 * 1024 ** 3
+
+
+def blob_sha(data):
+    """Git blob SHA-1 of ``data`` (the same id GitHub reports for a file)."""
+    header = f"blob {len(data)}\0".encode()
+    return hashlib.sha1(header + data).hexdigest()
+
+
+def blob_sha_file(fileobj, chunk_size=1024 * 1024):
+    """Git blob SHA-1 of a seekable binary file, read in chunks from its start."""
+    fileobj.seek(0, os.SEEK_END)
+    size = fileobj.tell()
+    fileobj.seek(0)
+    digest = hashlib.sha1(f"blob {size}\0".encode())
+    for chunk in iter(lambda: fileobj.read(chunk_size), b""):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _to_bytes(content):
+    return content.encode("utf-8") if isinstance(content, str) else bytes(content)
+
+
+@dataclass
+class StoredFile:
+    path: str
+    sha: str
+    data: bytes
+
+
+@dataclass
+class _PathEntry:
+    sha: str | None          # None means "known not to exist"
+    checked_at: float
+    handle: object = None    # backend specific revalidation token
+
+
+def estimate_nbytes(value, seen=None):
+    """Rough in-memory size of a cached value; shared sub-objects count once."""
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    if isinstance(value, (bytes, bytearray, str)):
+        return len(value)
+    if type(value).__module__.startswith("pyarrow"):
+        return 0  # memory-mapped snapshot tables live in the page cache
+    if hasattr(value, "memory_usage"):  # pandas DataFrame / Series
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, "sum") else usage)
+    if hasattr(value, "nbytes") and hasattr(value, "dtype"):  # numpy array
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sum(estimate_nbytes(v, seen) for v in value.values())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sum(estimate_nbytes(v, seen) for v in value)
+    if hasattr(value, "__dict__"):
+        return estimate_nbytes(vars(value), seen)
+    return sys.getsizeof(value)
+
+
+class ContentCache:
+    """Thread-safe cache of file bytes and values derived from them, keyed by SHA.
+
+    With a ``budget`` (bytes), the least recently used SHAs -- every blob and
+    derived value of a cold dataset version -- are evicted once the estimated
+    total size exceeds it.  Sessions that still hold a frame keep it alive;
+    eviction only drops the cache's own reference.  ``on_discard`` callbacks
+    release anything kept outside the cache for a SHA (spilled files).
+    """
+
+    def __init__(self, budget=None):
+        self.budget = budget
+        self._lock = threading.RLock()
+        self._blobs = {}
+        self._derived = {}
+        self._pending = {}
+        self._sizes = {}
+        self._cleanups = {}
+        self._used = OrderedDict()   # SHAs, least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def total_bytes(self):
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def _touch(self, sha):
+        self._used[sha] = None
+        self._used.move_to_end(sha)
+
+    def _charge(self, sha, nbytes):
+        with self._lock:
+            if sha not in self._blobs and not any(key[0] == sha for key in self._derived):
+                return  # discarded while its value was being computed
+            self._sizes[sha] = self._sizes.get(sha, 0) + nbytes
+            self._touch(sha)
+            if self.budget is None:
+                return
+            total = sum(self._sizes.values())
+            busy = {key[0] for key in self._pending}
+            for cold in list(self._used):
+                if total <= self.budget:
+                    break
+                if cold == sha or cold in busy:
+                    continue
+                total -= self._sizes.get(cold, 0)
+                self.discard(cold)
+                self.evictions += 1
+                metrics.incr("cache_evictions")
+                logger.info("Evicted cached dataset version %s (budget %d bytes)", cold, self.budget)
+
+    def get(self, sha):
+        with self._lock:
+            data = self._blobs.get(sha)
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._touch(sha)
+        metrics.incr("cache_misses" if data is None else "cache_hits")
+        return data
+
+    def put(self, sha, data):
+        with self._lock:
+            if sha in self._blobs:
+                return
+            self._blobs[sha] = data
+        self._charge(sha, len(data))
+
+    def derived(self, sha, key, factory):
+        """Return ``factory()`` computed at most once per (sha, key).
+
+        Concurrent callers for the same key (say, a background warm-up and
+        a page rerun) wait for the first computation instead of repeating it.
+        """
+        with self._lock:
+            if (sha, key) in self._derived:
+                self.hits += 1
+                self._touch(sha)
+                metrics.incr("cache_hits")
+                return self._derived[(sha, key)]
+            pending = self._pending.get((sha, key))
+            owner = pending is None
+            if owner:
+                pending = self._pending[(sha, key)] = Future()
+        if not owner:
+            return pending.result()
+        try:
+            value = factory()
+        except BaseException as e:
+            with self._lock:
+                del self._pending[(sha, key)]
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            self.misses += 1
+            self._derived[(sha, key)] = value
+            del self._pending[(sha, key)]
+        metrics.incr("cache_misses")
+        pending.set_result(value)
+        self._charge(sha, estimate_nbytes(value))
+        return value
+
+    def on_discard(self, sha, callback):
+        """Call ``callback()`` once when ``sha`` is evicted or discarded."""
+        with self._lock:
+            self._cleanups.setdefault(sha, []).append(callback)
+
+    def discard(self, sha):
+        with self._lock:
+            self._blobs.pop(sha, None)
+            self._sizes.pop(sha, None)
+            self._used.pop(sha, None)
+            for k in [k for k in self._derived if k[0] == sha]:
+                del self._derived[k]
+            cleanups = self._cleanups.pop(sha, [])
+        for callback in cleanups:
+            try:
+                callback()
+            except Exception:
+                logger.warning("Cleanup for cached version %s failed", sha, exc_info=True)
+
+
+class StorageBackend:
+    """Base class: subclasses implement ``_lookup``/``_download``/``_write``/``_remove``."""
+
+    def __init__(self, cache=None, ttl=DEFAULT_TTL):
+        self.cache = cache if cache is not None else ContentCache()
+        self.ttl = ttl
+        self._entries = {}
+        self._lookups = {}                    # path -> Future of the lookup in flight
+        self._lock = threading.Lock()         # guards _entries/_lookups only, never held over I/O
+        self._write_lock = threading.Lock()   # serializes put/delete
+
+    # -- backend hooks -----------------------------------------------------
+    def _lookup(self, path, entry):
+        """Return ``(sha, handle)`` for ``path`` or ``(None, None)`` if missing.
+
+        ``entry`` is the previous cache entry (or None) and may be used for a
+        cheap conditional request.
+        """
+        raise NotImplementedError
+
+    def _download(self, path, sha, handle):
+        raise NotImplementedError
+
+    def _write(self, path, data, message, sha):
+        raise NotImplementedError
+
+    def _remove(self, path, message, sha):
+        raise NotImplementedError
+
+    # -- public API ----------------------------------------------------------
+    def _defer_revalidation(self):
+        """True when cached entries should be served without revalidating."""
+        return False
+
+    def stat(self, path):
+        """Current SHA of ``path`` (None if missing), re-validated at most once per TTL.
+
+        A known entry is served stale, instead of failing, when the backend
+        asks to defer revalidation or the lookup raises.
+        """
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and (time.monotonic() - entry.checked_at < self.ttl or self._defer_revalidation()):
+                return entry.sha
+            # One lookup per path at a time; concurrent callers wait for it
+            # instead of queueing their own request.
+            pending = self._lookups.get(path)
+            owner = pending is None
+            if owner:
+                pending = self._lookups[path] = Future()
+        if not owner:
+            return pending.result()
+        try:
+            sha = self._revalidate(path, entry)
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        else:
+            pending.set_result(sha)
+            return sha
+        finally:
+            with self._lock:
+                del self._lookups[path]
+
+    def _revalidate(self, path, entry):
+        now = time.monotonic()
+        try:
+            with metrics.span("storage.lookup"):
+                sha, handle = self._lookup(path, entry)
+        except Exception:
+            if entry is None:
+                raise
+            logger.warning("Could not revalidate %s; serving cached version", path, exc_info=True)
+            with self._lock:
+                entry.checked_at = now
+            return entry.sha
+        with self._lock:
+            current = self._entries.get(path)
+            if current is not entry and current is not None:
+                # A put/delete replaced the entry while the lookup ran
+                return current.sha
+            self._entries[path] = _PathEntry(sha, now, handle)
+        return sha
+
+    def get(self, path):
+        """Return a StoredFile for ``path`` or None if it does not exist."""
+        sha = self.stat(path)
+        if sha is None:
+            return None
+        data = self.cache.get(sha)
+        if data is None:
+            with self._lock:
+                handle = self._entries[path].handle
+            data = self._fetch(path, sha, handle)
+        return StoredFile(path, sha, data)
+
+    def get_blob(self, path, sha):
+        """Fetch a known version of ``path`` by SHA; no revalidation is needed."""
+        data = self.cache.get(sha)
+        if data is None:
+            data = self._fetch(path, sha, None)
+        return StoredFile(path, sha, data)
+
+    def _fetch(self, path, sha, handle):
+        with metrics.span("storage.download"):
+            data = self._download(path, sha, handle)
+        metrics.incr("storage_bytes_fetched", len(data))
+        self.cache.put(sha, data)
+        return data
+
+    def read(self, path):
+        stored = self.get(path)
+        return stored.data if stored is not None else None
+
+    def exists(self, path):
+        return self.stat(path) is not None
+
+    def local_path(self, path):
+        """Filesystem path holding ``path``'s bytes, if the backend has one."""
+        return None
+
+    def put(self, path, content, message="Update placement data"):
+        data = _to_bytes(content)
+        with self._write_lock:
+            previous = self.stat(path)
+            sha, handle = self._write(path, data, message, previous)
+            sha = sha or blob_sha(data)
+            self.cache.put(sha, data)
+            with self._lock:
+                self._entries[path] = _PathEntry(sha, time.monotonic(), handle)
+        return sha
+
+    def put_file(self, path, fileobj, message="Update placement data"):
+        """Store the contents of a seekable binary file object."""
+        fileobj.seek(0)
+        return self.put(path, fileobj.read(), message)
+
+    def delete(self, path, message="Delete placement data"):
+        with self._write_lock:
+            sha = self.stat(path)
+            if sha is None:
+                return False
+            self._remove(path, message, sha)
+            with self._lock:
+                self._entries[path] = _PathEntry(None, time.monotonic())
+        self.cache.discard(sha)
+        return True
+
+    def invalidate(self, path=None):
+        """Force re-validation of ``path`` (or every path) on next access."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+
+
+class LocalStorage(StorageBackend):
+    """Files under a local directory; revalidation is an ``os.stat`` call."""
+
+    def __init__(self, root, cache=None, ttl=DEFAULT_TTL):
+        super().__init__(cache, ttl)
+        self.root = os.path.abspath(root)
+        os.makedirs(self.root, exist_ok=True)
+
+    def _full(self, path):
+        return os.path.join(self.root, path)
+
+    def local_path(self, path):
+        full = self._full(path)
+        return full if os.path.exists(full) else None
+
+    def _lookup(self, path, entry):
+        try:
+            st = os.stat(self._full(path))
+        except FileNotFoundError:
+            return None, None
+        signature = (st.st_mtime_ns, st.st_size)
+        if entry is not None and entry.sha is not None and entry.handle == signature:
+            return entry.sha, signature
+        with open(self._full(path), "rb") as f:
+            data = f.read()
+        sha = blob_sha(data)
+        self.cache.put(sha, data)
+        return sha, signature
+
+    def _download(self, path, sha, handle):
+        with open(self._full(path), "rb") as f:
+            return f.read()
+
+    def _write(self, path, data, message, sha):
+        full = self._full(path)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        tmp = f"{full}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, full)
+        st = os.stat(full)
+        return blob_sha(data), (st.st_mtime_ns, st.st_size)
+
+    def _remove(self, path, message, sha):
+        os.remove(self._full(path))
+
+    def put_file(self, path, fileobj, message="Update placement data"):
+        # Stream to disk instead of materializing the whole file in memory.
+        full = self._full(path)
+        os.makedirs(os.path.dirname(full), exist_ok=True)
+        sha = blob_sha_file(fileobj)
+        fileobj.seek(0)
+        tmp = f"{full}.tmp"
+        with open(tmp, "wb") as f:
+            shutil.copyfileobj(fileobj, f)
+        with self._write_lock:
+            os.replace(tmp, full)
+            st = os.stat(full)
+            with self._lock:
+                self._entries[path] = _PathEntry(sha, time.monotonic(), (st.st_mtime_ns, st.st_size))
+        return sha
+
+
+class GitHubStorage(StorageBackend):
+    """Files in a GitHub repository, re-validated with conditional requests.
+
+    A 304 response to ``ContentFile.update()`` does not count against the
+    GitHub rate limit, so an unchanged file costs one cheap request per TTL.
+    While the client reports a low quota, cached files are not revalidated.
+    """
+
+    def __init__(self, client, cache=None, ttl=DEFAULT_TTL):
+        super().__init__(cache, ttl)
+        self.client = client
+
+    @property
+    def repo(self):
+        return self.client.repo
+
+    def _defer_revalidation(self):
+        return self.client.quota_low
+
+    def _lookup(self, path, entry):
+        from github import UnknownObjectException
+
+        try:
+            if entry is not None and entry.handle is not None:
+                self.client.call(entry.handle.update)
+                return entry.handle.sha, entry.handle
+            handle = self.client.call(self.repo.get_contents, path)
+        except UnknownObjectException:
+            return None, None
+        if isinstance(handle, list):
+            return None, None
+        return handle.sha, handle
+
+    def _download(self, path, sha, handle):
+        # The contents API omits the payload for files larger than 1 MB.
+        if handle is not None and handle.sha == sha and handle.content:
+            return base64.b64decode(handle.content)
+        blob = self.client.call(self.repo.get_git_blob, sha)
+        return base64.b64decode(blob.content)
+
+    def _current_sha(self, path):
+        # After a failed write: what the path holds now, or False if unknown.
+        try:
+            return self._lookup(path, None)[0]
+        except Exception:
+            logger.warning("Could not re-check %s after a failed write", path, exc_info=True)
+            return False
+
+    def _write(self, path, data, message, sha):
+        try:
+            if sha is None:
+                result = self.client.write(self.repo.create_file, path, message, data)
+            else:
+                result = self.client.write(self.repo.update_file, path, message, data, sha)
+        except Exception:
+            # The commit may have landed before the request failed (a timeout
+            # or 5xx); if the path now holds exactly ``data``, it succeeded.
+            expected = blob_sha(data)
+            if self._current_sha(path) == expected:
+                return expected, None
+            raise
+        # The returned ContentFile carries no etag, so the next stat does a
+        # full lookup rather than a conditional request.
+        return result["content"].sha, None
+
+    def _remove(self, path, message, sha):
+        try:
+            self.client.write(self.repo.delete_file, path, message, sha)
+        except Exception:
+            if self._current_sha(path) is None:
+                return
+            raise
+
+
+def create_storage(secrets):
+    """Build the backend described by the app secrets.
+
+    ``[storage] backend = "local"`` (with an optional ``path``) selects the
+    local filesystem; otherwise the ``[github]`` token/repo_url are used.
+    ``[storage] cache_ttl`` overrides the revalidation interval in seconds and
+    ``[storage] low_quota`` the remaining-request count below which cached
+    GitHub content is served without revalidation, and ``[storage]
+    memory_budget_mb`` the size above which cold datasets are evicted from
+    the content cache.
+    """
+    from hirelytics.github_client import LOW_QUOTA, GitHubClient
+
+    config = secrets.get("storage", {})
+    ttl = float(config.get("cache_ttl", DEFAULT_TTL))
+    budget = config.get("memory_budget_mb")
+    cache = ContentCache(int(float(budget) * 1024 ** 2) if budget is not None else DEFAULT_MEMORY_BUDGET)
+    if config.get("backend", "github") == "local":
+        return LocalStorage(config.get("path", "data"), cache=cache, ttl=ttl)
+    github = secrets["github"]
+    client = GitHubClient(github["token"], github["repo_url"], low_quota=int(config.get("low_quota", LOW_QUOTA)))
+    return GitHubStorage(client, cache=cache, ttl=ttl)
+
+
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def shared_storage(secrets):
+    """The process-wide backend for ``secrets``, created on first use.
+
+    Every page and session gets the same instance, and therefore the same
+    GitHub client, connection pool and content cache.
+    """
+    config = secrets.get("storage", {})
+    github = secrets.get("github", {})
+    key = (
+        config.get("backend", "github"), config.get("path"), config.get("cache_ttl"), config.get("low_quota"),
+        config.get("memory_budget_mb"),
+        github.get("repo_url"), hashlib.sha256(str(github.get("token", "")).encode()).hexdigest(),
+    )
+    with _shared_lock:
+        if key not in _shared:
+            _shared[key] = create_storage(secrets)
+        return _shared[key]
@@ -0,0 +1,50 @@
+# Background warm-up of a college's dataset and derived indexes.
+#
+# Started when a student logs in, so the frame, skill index, dashboard
+# aggregates, model training set and "students like me" index are (being)
+# built while the first page renders.  Everything lands in the shared caches; a page that needs a value
+# still being computed waits for it rather than computing it again.
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from hirelytics.aggregates import AGGREGATE_COLS, aggregates_for
+from hirelytics.dataset import load_placement_frame
+from hirelytics.neighbors import NEIGHBOR_COLS, neighbor_index_for
+from hirelytics.skills import skill_index_for
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="warmup")
+_inflight = {}
+_lock = threading.Lock()
+
+
+def _warm(storage, college_code, model_registry):
+    source_sha, df = load_placement_frame(storage, college_code)
+    if df is None:
+        return None
+    skill_index = skill_index_for(storage.cache, source_sha, df) if 'Skills' in df.columns else None
+    if all(col in df.columns for col in AGGREGATE_COLS):
+        aggregates_for(storage.cache, source_sha, df)
+    if model_registry is not None and {'CGPA', 'Internship', 'Skills', 'Package'}.issubset(df.columns):
+        model_registry.training_set(college_code, source_sha, df, skill_index)
+        # sklearn takes about a second to import; do it here, not on the first Predict
+        import sklearn.linear_model  # noqa: F401
+    if all(col in df.columns for col in NEIGHBOR_COLS):
+        neighbor_index_for(storage.cache, source_sha, df, skill_index)
+    return source_sha
+
+
+def warm_up(storage, college_code, model_registry=None):
+    """Start (or join) the background warm-up for ``college_code``; returns a Future."""
+    with _lock:
+        future = _inflight.get(college_code)
+        if future is not None and not future.done():
+            return future
+        future = _executor.submit(_warm, storage, college_code, model_registry)
+        _inflight[college_code] = future
+    future.add_done_callback(
+        lambda f: f.exception() and logger.warning("Warm-up for %s failed", college_code, exc_info=f.exception())
+    )
+    return future
@@ -1,223 +1,483 @@
 import os
 import streamlit as st
 import pandas as pd
-import altair as alt
-import io
-from github import Github
-import base64
-import re
-from github import Github, Auth
+from hirelytics.dataset import load_placement_frame
+from hirelytics.ingest import IngestError, ingest, iter_clean_frames
+from hirelytics.jobs import job_service
+from hirelytics.metrics import configure as configure_metrics, finish_trace, prometheus_text, span, start_trace
+from hirelytics.partitions import append_partitions, delete_partitions, load_manifest
+from hirelytics.schema import REQUIRED_COLS
+from hirelytics.snapshot import snapshot_path, write_snapshot_chunks
+from hirelytics.storage import shared_storage
+# Heavier section dependencies are imported on first use
+# (python -m hirelytics.startup reports the cost per section)
 # Page config
 st.set_page_config(page_title="🔐 Admin Portal", layout="wide")
-st.title("🔐 College Admin Panel")
-st.markdown("---")
-
-# --- Session State for Login ---
-if "admin_logged_in" not in st.session_state:
-    st.session_state.admin_logged_in = False
-
-# --- Required template columns ---
-REQUIRED_COLS = ['CGPA', 'Package', 'Company', 'Branch', 'Internship', 'Year', 'Skills']
-
-# --- Template Excel file creation ---
-TEMPLATE_FILE = "placement_template.xlsx"
-if not os.path.exists(TEMPLATE_FILE):
-    pd.DataFrame(columns=REQUIRED_COLS).to_excel(TEMPLATE_FILE, index=False)
-
-# --- GitHub connection setup ---
-token = st.secrets["github"]["token"]
-repo_url = st.secrets["github"]["repo_url"]
-token = st.secrets["github"]["token"]
-g = Github(auth=Auth.Token(token))
-match = re.search(r"github\.com/([^/]+)/([^.]+)", repo_url)
-owner = match.group(1)
-repo_name = match.group(2)
-repo = g.get_repo(f"{owner}/{repo_name}")
-
-def upload_file(file_path, file_content, commit_message="Update placement data"):
-    try:
-        contents = repo.get_contents(file_path)
-        repo.update_file(contents.path, commit_message, file_content, contents.sha)
-    except:
-        repo.create_file(file_path, commit_message, file_content)
-
-def read_file(file_path):
-    try:
-        contents = repo.get_contents(file_path)
-        file_content = base64.b64decode(contents.content).decode("utf-8")
-        return file_content
-    except:
-        return None
-
-# --- Login Page ---
-if not st.session_state.admin_logged_in:
-    college_code = st.text_input("College Code")
-    username = st.text_input("Username")
-    password = st.text_input("Password", type="password")
-
-    if st.button("Login"):
-        admins = st.secrets["COLLEGE_CODES"]
-
-        if college_code in admins:
-            stored = admins[college_code]
-            stored_username, stored_password = stored.split(":")
-            if username == stored_username and password == stored_password:
-                st.session_state.admin_logged_in = True
-                st.session_state.college_code = college_code
-                st.session_state.admin_user = username
-                st.success(f"✅ Login successful! Welcome {username} from {college_code}.")
-                st.rerun()
+# Timing spans and counters for this rerun (see hirelytics.metrics)
+trace = start_trace("Admin")
+try:
+    configure_metrics(st.secrets)
+    st.title("🔐 College Admin Panel")
+    st.markdown("---")
+
+    # --- Session State for Login ---
+    if "admin_logged_in" not in st.session_state:
+        st.session_state.admin_logged_in = False
+
+    # --- Template Excel file creation ---
+    TEMPLATE_FILE = "placement_template.xlsx"
+    if not os.path.exists(TEMPLATE_FILE):
+        pd.DataFrame(columns=REQUIRED_COLS).to_excel(TEMPLATE_FILE, index=False)
+
+    # --- Placement data storage (shared by every session in this process) ---
+    storage = shared_storage(st.secrets)
+
+    def data_changed(college_code):
+        """Reload the college in the cross-college benchmarks after one of its writes."""
+        from hirelytics.analytics import college_changed
+
+        college_changed(storage, college_code)
+
+    # --- Login Page ---
+    if not st.session_state.admin_logged_in:
+        college_code = st.text_input("College Code")
+        username = st.text_input("Username")
+        password = st.text_input("Password", type="password")
+
+        if st.button("Login"):
+            admins = st.secrets["COLLEGE_CODES"]
+
+            if college_code in admins:
+                stored = admins[college_code]
+                stored_username, stored_password = stored.split(":")
+                if username == stored_username and password == stored_password:
+                    st.session_state.admin_logged_in = True
+                    st.session_state.college_code = college_code
+                    st.session_state.admin_user = username
+                    st.success(f"✅ Login successful! Welcome {username} from {college_code}.")
+                    st.rerun()
+                else:
+                    st.error("❌ Invalid username or password.")
             else:
-                st.error("❌ Invalid username or password.")
-        else:
-            st.error("❌ Invalid college code.")
+                st.error("❌ Invalid college code.")
 
-# --- Admin Dashboard ---
-else:
-    st.sidebar.button("Logout", on_click=lambda: st.session_state.update({"admin_logged_in": False}))
-
-    college_code = st.session_state.college_code
-    username = st.session_state.admin_user
-    data_file_csv = f"placement_data_{college_code}.csv"
-    data_file_xlsx = f"placement_data_{college_code}.xlsx"
-
-    st.markdown("""
-    ### 📂 Placement Data Upload Instructions
-
-    1. **Download the official template** from the link below **before** entering any data.
+    # --- Admin Dashboard ---
+    else:
+        st.sidebar.button("Logout", on_click=lambda: st.session_state.update({"admin_logged_in": False}))
+        st.sidebar.checkbox("Show profiling panel", key="show_profiling")
+
+        college_code = st.session_state.college_code
+        username = st.session_state.admin_user
+        data_file_csv = f"placement_data_{college_code}.csv"
+        data_file_xlsx = f"placement_data_{college_code}.xlsx"
+
+        st.markdown("""
+        ### 📂 Placement Data Upload Instructions
+
+        1. **Download the official template** from the link below **before** entering any data.
+
+        2. **Do not change** the column names or their order.
+
+        3. Keep the file format as `.xlsx` or `.csv`.
+        """, unsafe_allow_html=True)
+
+        # Template download
+        with open(TEMPLATE_FILE, "rb") as f:
+            st.download_button(
+                "📥 Download Placement Data Template (Excel)",
+                f,
+                file_name="placement_template.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            )
+
+        # File existence check (served from the shared content cache)
+        try:
+            with span("load_data"):
+                source_sha, df = load_placement_frame(storage, college_code, backfill=True)
+        except Exception as e:
+            st.error(f"Error loading saved placement data: {e}")
+            st.stop()
 
-    2. **Do not change** the column names or their order.
+        if source_sha is not None:
+            report = st.session_state.pop(f'ingest_report_{college_code}', None)
+            if report is not None:
+                st.success(f"✅ File validated, extra columns ignored, and {report.rows} rows saved successfully!")
+                if report.error_count:
+                    st.warning(f"⚠️ Skipped {report.error_count} invalid rows.")
+                    st.dataframe(
+                        pd.DataFrame([vars(error) for error in report.errors]).rename(columns=str.title),
+                        use_container_width=True
+                    )
 
-    3. Keep the file format as `.xlsx` or `.csv`.
-    """, unsafe_allow_html=True)
+            st.markdown(f"### ✅ Using Saved Placement Data for {username} ({college_code})")
+            st.dataframe(df.head(10), use_container_width=True)
 
-    # Template download
-    with open(TEMPLATE_FILE, "rb") as f:
-        st.download_button(
-            "📥 Download Placement Data Template (Excel)",
-            f,
-            file_name="placement_template.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-        )
+            # Append a new season: only the uploaded years' partitions are rewritten
+            with st.expander("➕ Append / Merge New Placement Data"):
+                manifest = load_manifest(storage, college_code)
+                dedup_key = st.multiselect(
+                    "Replace existing rows that match on",
+                    REQUIRED_COLS,
+                    default=manifest.dedup_key if manifest is not None else REQUIRED_COLS
+                )
+                append_file = st.file_uploader("Upload New Rows (.csv or .xlsx)", type=["csv", "xlsx"], key="append_file")
+
+                if append_file is not None and st.button("Append Data"):
+                    try:
+                        result = ingest(append_file, append_file.name)
+                    except IngestError as e:
+                        st.error(f"❌ {e}")
+                        st.stop()
+
+                    try:
+                        new_rows = pd.concat(iter_clean_frames(result), ignore_index=True)
+                        if manifest is None:
+                            # First append: move the single-file data into year partitions,
+                            # and only delete the source once every row is accounted for
+                            append_partitions(storage, college_code, new_rows.iloc[:0], dedup_key, existing_df=df)
+                            moved = load_manifest(storage, college_code)
+                            if moved is None or moved.rows != len(df):
+                                delete_partitions(storage, college_code)
+                                st.error(
+                                    f"❌ Moving the saved data into year partitions kept "
+                                    f"{moved.rows if moved is not None else 0} of {len(df)} rows; "
+                                    "nothing was changed."
+                                )
+                                st.stop()
+                            storage.delete(data_file_csv, "Move placement data to year partitions")
+                            storage.delete(data_file_xlsx, "Move placement data to year partitions")
+                            storage.delete(snapshot_path(college_code), "Move placement data to year partitions")
+                        append_partitions(storage, college_code, new_rows, dedup_key)
+                        data_changed(college_code)
+                    except Exception as e:
+                        st.error(f"Error appending data: {e}")
+                        st.stop()
+                    finally:
+                        result.close()
+
+                    st.session_state[f'ingest_report_{college_code}'] = result
+                    st.rerun()
 
-    # File existence check on GitHub
-    file_content_csv = read_file(data_file_csv)
-    file_content_xlsx = read_file(data_file_xlsx)
+            if st.button("🗑️ Delete File"):
+                try:
+                    delete_partitions(storage, college_code)
+                    storage.delete(data_file_csv, "Delete placement data")
+                    storage.delete(data_file_xlsx, "Delete placement data")
+                    storage.delete(snapshot_path(college_code), "Delete placement snapshot")
+                    data_changed(college_code)
+                    st.warning("File deleted. Please upload a new file.")
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Error deleting file: {e}")
 
-    if file_content_csv or file_content_xlsx:
-        if file_content_csv:
-            df = pd.read_csv(io.StringIO(file_content_csv))
         else:
-            df = pd.read_excel(io.BytesIO(base64.b64decode(read_file(data_file_xlsx).encode())))
-
-        df.columns = df.columns.str.strip()
-        st.session_state[f'placement_df_{college_code}'] = df
-
-        st.markdown(f"### ✅ Using Saved Placement Data for {username} ({college_code})")
-        st.dataframe(df.head(10), use_container_width=True)
-
-        if st.button("🗑️ Delete File"):
-            try:
-                if file_content_csv:
-                    contents = repo.get_contents(data_file_csv)
-                    repo.delete_file(contents.path, "Delete placement data", contents.sha)
-                if file_content_xlsx:
-                    contents = repo.get_contents(data_file_xlsx)
-                    repo.delete_file(contents.path, "Delete placement data", contents.sha)
-                st.session_state.pop(f'placement_df_{college_code}', None)
-                st.warning("File deleted. Please upload a new file.")
-                st.rerun()
-            except Exception as e:
-                st.error(f"Error deleting file: {e}")
-
-    else:
-        uploaded_file = st.file_uploader("Upload Placement Data (.csv or .xlsx)", type=["csv", "xlsx"])
-
-        if uploaded_file is not None:
-            try:
-                if uploaded_file.name.endswith('.csv'):
-                    df = pd.read_csv(uploaded_file)
-                    file_content = df.to_csv(index=False)
-                    upload_file(data_file_csv, file_content)
-                else:
-                    df = pd.read_excel(uploaded_file)
-                    buffer = io.BytesIO()
-                    df.to_excel(buffer, index=False)
-                    file_content = base64.b64encode(buffer.getvalue()).decode()
-                    upload_file(data_file_xlsx, file_content)
-
-                df.columns = df.columns.str.strip()
-                missing_cols = [col for col in REQUIRED_COLS if col not in df.columns]
+            uploaded_file = st.file_uploader("Upload Placement Data (.csv or .xlsx)", type=["csv", "xlsx"])
+
+            if uploaded_file is not None:
+                # Validate and clean chunk by chunk; nothing is stored unless the header is valid
+                try:
+                    result = ingest(uploaded_file, uploaded_file.name)
+                except IngestError as e:
+                    st.error(f"❌ {e}")
+                    st.stop()
+                except Exception as e:
+                    st.error(f"Error reading file: {e}")
+                    st.stop()
 
-                if missing_cols:
-                    st.error(f"❌ Missing required columns: {', '.join(missing_cols)}")
+                try:
+                    source_sha = storage.put_file(data_file_csv, result.csv)
+                    # Typed columnar snapshot read by the Student page
+                    write_snapshot_chunks(storage, college_code, iter_clean_frames(result), source_sha)
+                    data_changed(college_code)
+                except Exception as e:
+                    st.error(f"Error saving file: {e}")
                     st.stop()
-                else:
-                    df = df[REQUIRED_COLS]
-                    st.session_state[f'placement_df_{college_code}'] = df
-                    st.success("✅ File validated, extra columns ignored, and saved successfully!")
-                    st.rerun()
-            except Exception as e:
-                st.error(f"Error reading file: {e}")
-            st.stop()
+                finally:
+                    result.close()
 
-    # Show insights if data is available
-    if f'placement_df_{college_code}' in st.session_state:
-        df = st.session_state[f'placement_df_{college_code}']
-
-        required_cols = ['CGPA', 'Package', 'Company', 'Branch', 'Internship', 'Year']
-        missing_cols = [col for col in required_cols if col not in df.columns]
-
-        if not missing_cols:
-            st.markdown("## 📊 Visual Insights")
-            st.markdown("---")
-
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown("### CGPA vs Package")
-                st.scatter_chart(df, x="CGPA", y="Package", color="Branch")
-
-            with col2:
-                st.markdown("### Top Hiring Companies")
-                top_companies = df['Company'].value_counts().head(5)
-                st.bar_chart(top_companies)
-
-            col3, col4 = st.columns(2)
-            with col3:
-                st.markdown("### Internship Impact on Package")
-                box_plot = alt.Chart(df).mark_boxplot().encode(
-                    x="Internship:N",
-                    y="Package:Q"
-                )
-                st.altair_chart(box_plot, use_container_width=True)
-
-            with col4:
-                st.markdown("### Branch-wise Avg Package")
-                st.bar_chart(df.groupby('Branch')['Package'].mean())
-
-            col5, col6 = st.columns(2)
-            with col5:
-                st.markdown("### Year-wise Placement Count")
-
-                if 'Year' in df.columns:
-                    placement_data = df.groupby('Year').size().reset_index(name='Count')
-                    placement_data = placement_data.sort_values(by='Year')
-
-                    chart = alt.Chart(placement_data).mark_line(point=True).encode(
-                        x=alt.X('Year:O', title='Year'),
-                        y=alt.Y('Count:Q', title='Number of Students Placed'),
-                        tooltip=['Year', 'Count']
-                    ).properties(
-                        width=400,
-                        height=300,
-                        title="Year-wise Placement Count"
-                    )
+                st.session_state[f'ingest_report_{college_code}'] = result
+                st.rerun()
 
-                    st.altair_chart(chart, use_container_width=True)
-                else:
-                    st.warning("⚠️ 'Year' column missing from data. Cannot display placement trend.")
+        # Show insights if data is available (df is the shared, read-only frame;
+        # sessions never keep their own copy)
+        if df is not None:
+            required_cols = ['CGPA', 'Package', 'Company', 'Branch', 'Internship', 'Year']
+            missing_cols = [col for col in required_cols if col not in df.columns]
+
+            if not missing_cols:
+                with span("import.admin_charts"):
+                    import altair as alt
+                    from hirelytics.aggregates import aggregates_for
+                    from hirelytics.charts import boxplot_chart
+
+                st.markdown("## 📊 Visual Insights")
+                st.markdown("---")
+                aggregates = aggregates_for(storage.cache, source_sha, df)
+                insights = aggregates.get()
+
+                col1, col2 = st.columns(2)
+                with col1, span("chart.scatter"):
+                    st.markdown("### CGPA vs Package")
+                    st.scatter_chart(insights.scatter, x="CGPA", y="Package", color="Branch")
+
+                with col2, span("chart.top_companies"):
+                    st.markdown("### Top Hiring Companies")
+                    st.bar_chart(insights.top_companies)
+
+                col3, col4 = st.columns(2)
+                with col3, span("chart.internship_box"):
+                    st.markdown("### Internship Impact on Package")
+                    st.altair_chart(boxplot_chart(insights.internship_box, insights.box_outliers), use_container_width=True)
+
+                with col4, span("chart.branch_avg_package"):
+                    st.markdown("### Branch-wise Avg Package")
+                    st.bar_chart(insights.branch_avg_package)
+
+                col5, col6 = st.columns(2)
+                with col5, span("chart.year_counts"):
+                    st.markdown("### Year-wise Placement Count")
+
+                    if 'Year' in df.columns:
+                        placement_data = insights.year_counts
+
+                        chart = alt.Chart(placement_data).mark_line(point=True).encode(
+                            x=alt.X('Year:O', title='Year'),
+                            y=alt.Y('Count:Q', title='Number of Students Placed'),
+                            tooltip=['Year', 'Count']
+                        ).properties(
+                            width=400,
+                            height=300,
+                            title="Year-wise Placement Count"
+                        )
+
+                        st.altair_chart(chart, use_container_width=True)
+                    else:
+                        st.warning("⚠️ 'Year' column missing from data. Cannot display placement trend.")
+
+                with st.expander("📄 Export Placement Report"):
+                    with span("import.report"):
+                        from hirelytics.report import FORMATS, report_for
+
+                    report_col1, report_col2, report_col3 = st.columns(3)
+                    report_branch = report_col1.selectbox("Branch", ["All"] + aggregates.branches, key="report_branch")
+                    report_year = report_col2.selectbox("Year", ["All"] + aggregates.years, key="report_year")
+                    report_format = report_col3.radio("Format", ["PDF", "XLSX"], horizontal=True, key="report_format").lower()
+
+                    # Built in the background and cached per dataset version and slice
+                    if st.button("Generate Report"):
+                        st.session_state.report_job = job_service().submit(
+                            "report", report_for, storage.cache, source_sha, df, aggregates,
+                            report_branch, report_year, report_format, college_code,
+                            key=(source_sha, report_branch, report_year, report_format, college_code)
+                        ).id
+
+                    # The job's key records the slice it was built for; reports of older data are not offered
+                    report_job = job_service().get(st.session_state.get("report_job"))
+                    if report_job is not None and report_job.key[0] == source_sha:
+                        _, job_branch, job_year, job_format, _ = report_job.key
+                        if not report_job.done():
+                            with st.spinner("Generating report..."):
+                                report_job.wait(0.5)
+                            if not report_job.done():
+                                st.rerun()
+                        try:
+                            report_bytes = report_job.result()
+                        except ValueError as e:
+                            st.error(f"❌ {e}")
+                        else:
+                            slice_name = "_".join(str(v) for v in (job_branch, job_year) if v != "All") or "all"
+                            st.download_button(
+                                f"📥 Download Placement Report ({job_format.upper()}, {slice_name})",
+                                report_bytes,
+                                file_name=f"placement_report_{college_code}_{slice_name}.{job_format}",
+                                mime=FORMATS[job_format]
+                            )
+
+                if 'Skills' in df.columns:
+                    st.markdown("## 📑 Batch Resume Screening")
+                    st.markdown("---")
+                    resume_zip = st.file_uploader("Upload Resumes (.zip of PDFs)", type=["zip"])
+
+                    if resume_zip is not None and st.button("Screen Resumes"):
+                        with span("import.batch_screening"):
+                            import hashlib
+                            from hirelytics.batch import screen_archive
+                            from hirelytics.resume import placement_profile
+                            from hirelytics.skills import skill_index_for
+
+                        # Screened in the background; the resumes are parsed on the job
+                        # service's shared pdf_text pool
+                        profile = placement_profile(df, skill_index_for(storage.cache, source_sha, df))
+                        resume_data = resume_zip.getvalue()
+                        screening_progress = st.session_state.screening_progress = {"done": 0, "total": None}
+                        st.session_state.screening_job = job_service().submit(
+                            "screening", screen_archive, resume_data, profile,
+                            executor=job_service().executor("pdf_text"),
+                            progress=lambda done, total: screening_progress.update(done=done, total=total),
+                            key=(source_sha, hashlib.sha256(resume_data).hexdigest())
+                        ).id
+
+                    # Results of older placement data are not offered
+                    screening_job = job_service().get(st.session_state.get("screening_job"))
+                    if screening_job is not None and screening_job.key[0] == source_sha:
+                        with span("import.batch_screening"):
+                            from hirelytics.batch import FIELDS as BATCH_FIELDS, rows_to_csv
+
+                        if not screening_job.done():
+                            screening_progress = st.session_state.get("screening_progress", {})
+                            if screening_progress.get("total"):
+                                done, total = screening_progress["done"], screening_progress["total"]
+                                st.progress(done / total, text=f"Screened {done} of {total} resumes...")
+                            with st.spinner("Screening resumes..."):
+                                screening_job.wait(0.5)
+                            if not screening_job.done():
+                                st.rerun()
+                        try:
+                            rows = screening_job.result()
+                        except Exception as e:
+                            st.error(f"❌ Could not screen the archive: {e}")
+                        else:
+                            st.success(f"✅ Screened {len(rows)} resumes.")
+                            st.dataframe(pd.DataFrame(rows, columns=BATCH_FIELDS), use_container_width=True)
+                            st.download_button(
+                                "📥 Download Screening Results (CSV)",
+                                rows_to_csv(rows),
+                                file_name=f"resume_screening_{college_code}.csv",
+                                mime="text/csv"
+                            )
+
+                    st.markdown("## 🎯 Cohort Placement Scoring")
+                    st.markdown("---")
+                    st.caption("Columns: CGPA, Internship, Skills (any other columns, e.g. Roll No, are kept).")
+                    cohort_file = st.file_uploader("Upload Cohort (.csv, .xlsx or .parquet)", type=["csv", "xlsx", "parquet"])
+                    cohort_format = st.radio("Output format", ["CSV", "Parquet"], horizontal=True)
+
+                    if cohort_file is not None and st.button("Score Cohort"):
+                        with span("import.cohort"):
+                            import hashlib
+                            from functools import partial
+                            from hirelytics.cohort import score_to_bytes
+                            from hirelytics.model import shared_model_registry
+                            from hirelytics.skills import skill_index_for
+
+                        # Scored in the background with the Student page's training set and
+                        # cached models; the cohort's own fits are not cached there
+                        cohort_data = cohort_file.getvalue()
+                        fit = partial(
+                            shared_model_registry().get, college_code, source_sha, df,
+                            skill_index=skill_index_for(storage.cache, source_sha, df), store=False
+                        )
+                        parquet = cohort_format == "Parquet"
+                        st.session_state.cohort_job = job_service().submit(
+                            "cohort", score_to_bytes, fit, cohort_data, cohort_file.name, parquet,
+                            key=(source_sha, hashlib.sha256(cohort_data).hexdigest(), cohort_file.name, parquet)
+                        ).id
+
+                    if st.session_state.get("cohort_job") is not None:
+                        # Scores of older placement data are not offered
+                        cohort_job = job_service().get(st.session_state.cohort_job)
+                        if cohort_job is not None and cohort_job.key[0] == source_sha:
+                            if not cohort_job.done():
+                                with st.spinner("Scoring cohort (one model per distinct skill set)..."):
+                                    cohort_job.wait(0.5)
+                                if not cohort_job.done():
+                                    st.rerun()
+                            try:
+                                rows, scored_data = cohort_job.result()
+                            except IngestError as e:
+                                st.error(f"❌ {e}")
+                            else:
+                                parquet = cohort_job.key[3]
+                                st.success(f"✅ Scored {rows} students.")
+                                st.download_button(
+                                    "📥 Download Cohort Scores",
+                                    scored_data,
+                                    file_name=f"cohort_scores_{college_code}.{'parquet' if parquet else 'csv'}",
+                                    mime="application/octet-stream" if parquet else "text/csv"
+                                )
+
+                st.markdown("## 🏫 Cross-College Benchmarks")
+                st.markdown("---")
+                # Loading every college's data is opt-in and runs as a background
+                # job, so ordinary Admin reruns do not pay for it.
+                if st.checkbox("Compare with other colleges in the group", key="show_benchmarks"):
+                    with span("import.benchmarks"):
+                        from hirelytics.analytics import analytics_store
+
+                    # Only colleges whose data changed since the last refresh are reloaded
+                    store = analytics_store(storage)
+                    college_codes = list(st.secrets["COLLEGE_CODES"].keys())
+                    if st.button("🔄 Refresh Benchmarks"):
+                        st.session_state.benchmarks_job = job_service().submit("analytics", store.refresh, college_codes).id
+                    elif store.frame is None and st.session_state.get("benchmarks_job") is None:
+                        st.session_state.benchmarks_job = job_service().submit(
+                            "analytics", store.refresh, college_codes, key=id(store)
+                        ).id
+
+                    benchmarks_job = job_service().get(st.session_state.get("benchmarks_job"))
+                    if benchmarks_job is not None and not benchmarks_job.done():
+                        with st.spinner("Loading placement data of every college..."):
+                            benchmarks_job.wait(0.5)
+                        if not benchmarks_job.done():
+                            st.rerun()
+                    if benchmarks_job is not None:
+                        try:
+                            benchmarks_job.result()
+                        except Exception:
+                            st.error("❌ Could not load the other colleges' data. Try refreshing.")
+
+                    if store.frame is not None:
+                        branch = st.selectbox("Branch", options=["All"] + sorted(store.frame['Branch'].dropna().unique()))
+                        st.markdown("### Package Percentiles (placed students)")
+                        st.dataframe(
+                            store.package_percentiles(branch=None if branch == "All" else branch),
+                            use_container_width=True
+                        )
+
+                        st.markdown("### Placement Rate by Year")
+                        rates = store.placement_rates()
+                        rate_chart = alt.Chart(rates).mark_line(point=True).encode(
+                            x=alt.X('Year:O', title='Year'),
+                            y=alt.Y('PlacementRate:Q', title='Placement Rate', axis=alt.Axis(format='%')),
+                            color='College:N',
+                            tooltip=['College', 'Year', 'Students', 'PlacementRate', 'YoYChange']
+                        )
+                        st.altair_chart(rate_chart, use_container_width=True)
+
+                        st.markdown("### Shared Hiring Companies")
+                        st.dataframe(store.company_overlap(), use_container_width=True)
+            else:
+                st.error(f"Missing required columns: {', '.join(missing_cols)}")
+                st.code(", ".join(required_cols))
         else:
-            st.error(f"Missing required columns: {', '.join(missing_cols)}")
-            st.code(", ".join(required_cols))
-    else:
-        st.info("Please upload a file to begin analysis.")
+            st.info("Please upload a file to begin analysis.")
+finally:
+    # --- Profiling panel: where this rerun's time and memory went ---
+    # (in ``finally`` so st.rerun()/st.stop() and polling reruns are traced too)
+    finish_trace(trace)
+    if st.session_state.get("admin_logged_in") and st.session_state.get("show_profiling"):
+        with st.sidebar.expander("⏱️ Rerun Profile", expanded=True):
+            st.metric("Rerun time", f"{trace.duration * 1000:.0f} ms")
+            if trace.rss_end is not None:
+                st.metric(
+                    "Resident memory",
+                    f"{trace.rss_end / 2**20:.0f} MB",
+                    delta=f"{(trace.rss_end - trace.rss_start) / 2**20:+.1f} MB",
+                    delta_color="inverse"
+                )
+            spans = sorted(trace.spans, key=lambda s: s.start)
+            st.dataframe(
+                pd.DataFrame({
+                    "Stage": ["· " * s.depth + s.name for s in spans],
+                    "ms": [round(s.duration * 1000, 1) for s in spans],
+                }),
+                hide_index=True,
+                use_container_width=True
+            )
+            if trace.counters:
+                st.dataframe(
+                    pd.DataFrame(sorted(trace.counters.items()), columns=["Counter", "Value"]),
+                    hide_index=True,
+                    use_container_width=True
+                )
+            st.download_button("📥 Process Metrics (Prometheus)", prometheus_text(), file_name="metrics.txt", mime="text/plain")